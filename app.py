@@ -5,14 +5,15 @@
 import streamlit as st
 from styles import load_css
 from supp import create_runes_list
-from volva import display_volva
 from constants import COLORS
 from features import (
     display_browse_runes,
     display_rune_of_the_day,
     display_rune_layout,
     display_celtic_cross,
+    display_search,
 )
+from warmup import start_warmup
 
 
 st.set_page_config(page_title="Rune Witch", page_icon="🔮")
@@ -22,6 +23,9 @@ st.set_page_config(page_title="Rune Witch", page_icon="🔮")
 
 def main():
 
+    # Rozgrzewanie w tle (RUNE_WARMUP=1) - tylko za pierwszym razem w procesie
+    start_warmup()
+
     # Wczytaj style
     load_css()
 
@@ -32,7 +36,7 @@ def main():
     st.sidebar.title("Rune Witch")
     opcja = st.sidebar.selectbox(
         "Wybierz opcję", 
-        ["Przeglądaj runy", "Runa dnia", "Krzyż celtycki", "Rozkłady Runiczne", "Völva"]
+        ["Przeglądaj runy", "Runa dnia", "Krzyż celtycki", "Rozkłady Runiczne", "Szukaj", "Völva"]
     )
 
     # Wywołanie funkcji przeglądania run
@@ -50,7 +54,13 @@ def main():
     elif opcja == "Rozkłady Runiczne":
         display_rune_layout(runy)
 
+    # Wyszukiwanie w opisach run
+    elif opcja == "Szukaj":
+        display_search(runy)
+
     elif opcja == "Völva":
+        # Völva (i biblioteka openai) ładowana dopiero przy pierwszym wejściu na stronę
+        from volva import display_volva
         display_volva()  
         
 if __name__ == "__main__":
@@ -0,0 +1,168 @@
+###########################################################################
+#! "assets" - gotowe warianty obrazów zbudowane przez build_assets.py
+###########################################################################
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from constants import ASSET_MANIFEST_PATH, ATLAS_MAP_PATH, CACHE_PATH, DATA_PATH, STATIC_PATH, STATIC_URL
+
+
+MANIFEST_VERSION = 1
+ATLAS_VERSION = 1
+
+
+def variant_name(source_path, size, is_reversed=False):
+    """Zwraca względną ścieżkę wariantu, np. 'img_rune/algiz_300x300_n.jpg'."""
+    rel_dir, filename = os.path.split(os.path.relpath(source_path, DATA_PATH))
+    rel_dir = rel_dir.replace(os.sep, "/")
+    stem = os.path.splitext(filename)[0]
+    orientation = "r" if is_reversed else "n"
+    return f"{rel_dir}/{stem}_{size[0]}x{size[1]}_{orientation}.jpg"
+
+
+def is_source_fresh(source_path, entry):
+    """Sprawdza, czy mtime i rozmiar pliku źródłowego zgadzają się z zapisanymi w manifeście."""
+    try:
+        stat = os.stat(source_path)
+    except OSError:
+        return False
+    return stat.st_mtime == entry["source_mtime"] and stat.st_size == entry["source_size"]
+
+
+class JSONManifest:
+    """Plik JSON zbudowany offline, przeładowywany po zmianie na dysku."""
+
+    def __init__(self, path, version, cache_dir=CACHE_PATH):
+        self.path = path
+        self.version = version
+        self.cache_dir = cache_dir
+        self._data = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    @property
+    def data(self):
+        """Zwraca aktualną zawartość manifestu (pusty słownik, gdy go brak)."""
+        self._refresh()
+        return self._data
+
+    def _refresh(self):
+        """Wczytuje manifest ponownie, jeśli plik zmienił się na dysku."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            self._data, self._mtime = {}, None
+            return
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Nie można wczytać manifestu {self.path}: {e}")
+                manifest = {}
+            if manifest.get("version") != self.version:
+                manifest = {}
+            self._data = manifest
+            self._mtime = mtime
+
+
+class AssetManifest(JSONManifest):
+    """Manifest wariantów obrazów w data/cache."""
+
+    def __init__(self, path=ASSET_MANIFEST_PATH, cache_dir=CACHE_PATH):
+        super().__init__(path, MANIFEST_VERSION, cache_dir)
+
+    def lookup(self, source_path, size, is_reversed=False):
+        """
+        Zwraca ścieżkę gotowego wariantu lub None, gdy go brak albo jest nieaktualny.
+
+        Wariant jest aktualny, gdy mtime i rozmiar pliku źródłowego zgadzają się
+        z wartościami zapisanymi w manifeście podczas budowania.
+        """
+        entry = self.data.get("variants", {}).get(variant_name(source_path, size, is_reversed))
+        if entry is None or not is_source_fresh(source_path, entry):
+            return None
+        path = os.path.join(self.cache_dir, entry["file"])
+        return path if os.path.exists(path) else None
+
+
+def atlas_key(width, is_reversed=False):
+    """Zwraca klucz atlasu dla szerokości kafelka i orientacji, np. '300_n'."""
+    return f"{width}_{'r' if is_reversed else 'n'}"
+
+
+class RuneAtlas(JSONManifest):
+    """Mapa współrzędnych atlasów run (jeden obraz na rozmiar i orientację)."""
+
+    def __init__(self, path=ATLAS_MAP_PATH, cache_dir=CACHE_PATH):
+        super().__init__(path, ATLAS_VERSION, cache_dir)
+
+    def tile(self, rune_name, width, is_reversed=False):
+        """
+        Zwraca (url_atlasu, rozmiar_atlasu, kafelek) lub None, gdy atlasu brak
+        albo obraz runy zmienił się od czasu budowania.
+        """
+        atlas = self.data.get("atlases", {}).get(atlas_key(width, is_reversed))
+        if atlas is None:
+            return None
+        tile = atlas["tiles"].get(rune_name)
+        if tile is None or not is_source_fresh(os.path.join(DATA_PATH, tile["source"]), tile):
+            return None
+        return atlas["url"], (atlas["width"], atlas["height"]), tile
+
+
+class StaticImageStore:
+    """Publikuje obrazy jako pliki nazwane skrótem treści w katalogu static/ Streamlita."""
+
+    def __init__(self, folder="img", static_path=STATIC_PATH, static_url=STATIC_URL):
+        self.folder = folder
+        self.directory = os.path.join(static_path, folder)
+        self.base_url = f"{static_url}/{folder}"
+
+    def publish(self, data, extension="jpg"):
+        """
+        Zapisuje bajty (jeśli jeszcze ich nie ma) i zwraca adres URL pliku.
+
+        Nazwa pliku zależy tylko od treści, więc plik pod danym adresem nigdy się
+        nie zmienia. Sam Streamlit nie wysyła jednak nagłówka Cache-Control dla
+        app/static (parametr `v` działał tylko w starszych serwerach na Tornado) -
+        długi czas cache trzeba ustawić w proxy, np. "Cache-Control: public,
+        max-age=31536000, immutable" dla /app/static/img/ i /app/static/atlas/.
+        """
+        if not data:
+            return ""
+        digest = hashlib.sha256(data).hexdigest()[:20]
+        filename = f"{digest}.{extension}"
+        path = os.path.join(self.directory, filename)
+        if not os.path.exists(path):
+            # Każdy zapis ma własny plik tymczasowy - wątki sesji i rozgrzewania mogą
+            # publikować ten sam obraz jednocześnie; identyczna treść może nadpisać plik
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.chmod(tmp_path, 0o644)  # mkstemp tworzy plik 0600 - proxy też musi go odczytać
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                # Plik o tej nazwie ma z definicji tę samą treść - wystarczy, że już istnieje
+                if not os.path.exists(path):
+                    raise
+        return f"{self.base_url}/{filename}?v={digest}"
+
+
+# Wspólny dla procesu manifest wariantów
+ASSET_MANIFEST = AssetManifest()
+
+# Atlasy run dla strony przeglądania
+RUNE_ATLAS = RuneAtlas()
+
+# Obrazy serwowane jako pliki statyczne (tryb RUNE_IMAGE_MODE=static)
+STATIC_IMAGES = StaticImageStore()
@@ -0,0 +1,433 @@
+#?##########################################################################################################
+#TODO "bench.py" - pomiary wydajności aplikacji
+#?##########################################################################################################
+"""
+Pomiary uruchamiane ręcznie z katalogu głównego projektu, np.:
+    python bench.py payload
+    python bench.py decode [--width 300] [--repeat 5]
+    python bench.py batch [--runes 8] [--workers 4]
+    python bench.py startup [--repeat 5]
+    python bench.py reruns [--repeat 1000]
+    python bench.py session
+    python bench.py deltas [--pages ...]
+    python bench.py imports [--module app] [--top 15]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+from constants import BROWSE_PAGE_SIZES
+
+
+PAGES = ["Przeglądaj runy", "Runa dnia", "Krzyż celtycki", "Rozkłady Runiczne"]
+
+# Największe oryginały, dla których pełne dekodowanie kosztuje najwięcej
+DECODE_IMAGES = [
+    "img_rune/mannaz.jpg", "img_rune/berkano.jpg", "img_rune/jera.jpg",
+    "img_main/main1.jpg", "img_main/main2.jpg", "img_main/main3.jpg", "img_main/maina.jpg",
+]
+
+
+def run_page(page, click_first_button=True):
+    """Uruchamia stronę aplikacji w AppTest i zwraca wynik ostatniego przebiegu."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file("app.py", default_timeout=120).run()
+    at = at.sidebar.selectbox[0].select(page).run()
+    if click_first_button and at.button:
+        at = at.button[0].click().run()
+    return at
+
+
+def bench_payload(pages):
+    """Porównuje rozmiar HTML wysyłanego w delcie dla trybów obrazów inline i static."""
+    from models import HTMLRenderer
+
+    print(f"{'strona':<22}{'tryb':<8}{'markdown':>10}{'obrazy':>8}{'HTML obrazów':>16}{'cała delta':>14}")
+    for page in pages:
+        for mode in ("inline", "static"):
+            HTMLRenderer.set_render_mode(mode)
+            at = run_page(page)
+            sizes = [len(md.value.encode("utf-8")) for md in at.markdown]
+            image_sizes = [size for size, md in zip(sizes, at.markdown)
+                           if "<img" in md.value or 'role="img"' in md.value]
+            print(f"{page:<22}{mode:<8}{len(sizes):>10}{len(image_sizes):>8}"
+                  f"{sum(image_sizes):>16,}{sum(sizes):>14,}")
+
+
+def _decode(path, size, fast):
+    """Dekoduje i skaluje obraz pełną (fast=False) lub szybką ścieżką."""
+    from models import ImageProcessor
+
+    img = ImageProcessor.open_image(path, size if fast else None)
+    return ImageProcessor.resize_image(img, size[0], size[1])
+
+
+def _peak_rss_kb(mode, width):
+    """Uruchamia dekodowanie w osobnym procesie i zwraca jego szczytowe RSS w KB."""
+    result = subprocess.run(
+        [sys.executable, __file__, "decode-peak", mode, "--width", str(width)],
+        capture_output=True, text=True, check=True,
+    )
+    return int(result.stdout.strip().splitlines()[-1])
+
+
+def _peak_rss_self_kb():
+    """Zwraca szczytowe RSS bieżącego procesu w KB.
+
+    VmHWM jest zerowany przy exec, w przeciwieństwie do ru_maxrss, który
+    dziedziczy szczyt po procesie rodzica.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def decode_peak(mode, width):
+    """Wewnętrzne: dekoduje wszystkie obrazy testowe i wypisuje szczytowe RSS procesu."""
+    from constants import DATA_PATH
+    import models  # noqa: F401 - ten sam zestaw importów we wszystkich trybach
+
+    if mode != "none":
+        for rel_path in DECODE_IMAGES:
+            _decode(os.path.join(DATA_PATH, rel_path), (width, width), fast=(mode == "fast"))
+    print(_peak_rss_self_kb())
+
+
+def bench_decode(width, repeat):
+    """Porównuje czas, pamięć i jakość pełnego dekodowania z dekodowaniem w zmniejszonej skali."""
+    from PIL import ImageChops, ImageStat
+    from constants import DATA_PATH, FAST_DECODE_MAX_MEAN_DIFF
+
+    size = (width, width)
+    worst = 0.0
+    print(f"{'obraz':<24}{'pełne ms':>10}{'szybkie ms':>12}{'przysp.':>9}{'śr. różn.':>11}{'maks.':>7}")
+    for rel_path in DECODE_IMAGES:
+        path = os.path.join(DATA_PATH, rel_path)
+        timings = {}
+        for fast in (False, True):
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                _decode(path, size, fast)
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[fast] = statistics.median(samples)
+
+        full, quick = _decode(path, size, False), _decode(path, size, True)
+        if quick.size != full.size:
+            quick = quick.resize(full.size)
+        diff = ImageChops.difference(full, quick)
+        mean_diff = statistics.mean(ImageStat.Stat(diff).mean)
+        max_diff = max(high for _, high in diff.getextrema())
+        worst = max(worst, mean_diff)
+        print(f"{rel_path:<24}{timings[False]:>10.1f}{timings[True]:>12.1f}"
+              f"{timings[False] / timings[True]:>8.1f}x{mean_diff:>11.2f}{max_diff:>7}")
+
+    if sys.platform != "win32":
+        baseline = _peak_rss_kb("none", width)
+        print(f"Szczytowe RSS ponad import: pełne {(_peak_rss_kb('full', width) - baseline) / 1024:.1f} MB, "
+              f"szybkie {(_peak_rss_kb('fast', width) - baseline) / 1024:.1f} MB")
+
+    ok = worst <= FAST_DECODE_MAX_MEAN_DIFF
+    print(f"Jakość: największa średnia różnica {worst:.2f} (próg {FAST_DECODE_MAX_MEAN_DIFF}) - "
+          f"{'OK' if ok else 'PRZEKROCZONO'}")
+    return 0 if ok else 1
+
+
+def bench_batch(rune_count, workers):
+    """Porównuje przygotowanie obrazów układu run: kolejno vs pula wątków vs pula procesów."""
+    from constants import INTERACTIVE_WIDTH
+    from models import IMAGE_CACHE, ImageProcessor
+    from supp import create_runes_list
+
+    runy = create_runes_list()[:rune_count]
+    size = (INTERACTIVE_WIDTH, INTERACTIVE_WIDTH)
+    jobs = [(runa, size, i % 3 == 0) for i, runa in enumerate(runy)]
+    stages = ("decode", "resize", "encode", "src")
+
+    print(f"{'wariant':<12}{'czas ms':>9}" + "".join(f"{stage + ' ms':>12}" for stage in stages))
+    for variant in ("sequential", "thread", "process"):
+        IMAGE_CACHE.clear()
+        start = time.perf_counter()
+        if variant == "sequential":
+            timings = []
+            for runa, job_size, is_reversed in jobs:
+                data, job_timings = ImageProcessor.load_jpeg_timed(runa.obraz, job_size, is_reversed, False)
+                stage_start = time.perf_counter()
+                ImageProcessor.to_src(data)
+                job_timings["src"] = time.perf_counter() - stage_start
+                timings.append(job_timings)
+        else:
+            # Rozgrzanie puli, żeby nie mierzyć uruchamiania procesów
+            ImageProcessor._get_executor(variant, workers).submit(time.sleep, 0).result()
+            _, timings = ImageProcessor.prepare_batch(jobs, executor=variant, max_workers=workers,
+                                                      use_variants=False)
+        wall = (time.perf_counter() - start) * 1000
+        sums = [sum(t.get(stage, 0) for t in timings) * 1000 for stage in stages]
+        print(f"{variant:<12}{wall:>9.1f}" + "".join(f"{value:>12.1f}" for value in sums))
+    print("Czasy etapów to suma po wszystkich obrazach (w pulach biegną równolegle).")
+
+
+def startup_child(mode):
+    """Wewnętrzne: ładuje repozytorium run w świeżym procesie i wypisuje czas w ms."""
+    from constants import CORPUS_SNAPSHOT_PATH
+    from repository import RuneRepository
+
+    repository = RuneRepository(snapshot_path=CORPUS_SNAPSHOT_PATH if mode == "snapshot" else None)
+    if mode == "snapshot" and not repository.from_snapshot:
+        print("-1")
+        return
+    print(f"{repository.load_seconds * 1000:.3f}")
+
+
+def bench_startup(repeat):
+    """Porównuje zimny start repozytorium run: parsowanie i walidacja JSON vs snapshot."""
+    results = {}
+    for mode in ("json", "snapshot"):
+        samples = []
+        for _ in range(repeat):
+            result = subprocess.run([sys.executable, __file__, "startup-child", mode],
+                                    capture_output=True, text=True, check=True)
+            samples.append(float(result.stdout.strip().splitlines()[-1]))
+        if min(samples) < 0:
+            print("Brak aktualnego snapshotu - uruchom: python build_assets.py snapshot")
+            return 1
+        results[mode] = statistics.median(samples)
+        print(f"{mode:<10}{results[mode]:>10.2f} ms (mediana z {repeat})")
+    print(f"Przyspieszenie: {results['json'] / results['snapshot']:.1f}x")
+    return 0
+
+
+def _allocations(func):
+    """Zwraca (bajty, bloki) pamięci zaalokowanej i utrzymanej przez wynik wywołania."""
+    import tracemalloc
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = func()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    del result
+    return sum(stat.size_diff for stat in diff), sum(stat.count_diff for stat in diff)
+
+
+def bench_reruns(repeat):
+    """Porównuje koszt listy run w każdym przebiegu skryptu: budowanie od nowa vs obiekty współdzielone."""
+    from models import Runa
+    from repository import get_repository
+    from supp import create_runes_list
+
+    records = get_repository().records
+    variants = {
+        "od nowa": lambda: [Runa.from_record(record) for record in records],
+        "wspólne": create_runes_list,
+    }
+    create_runes_list()
+
+    print(f"{'wariant':<12}{'µs / przebieg':>15}{'bajty':>10}{'bloki':>8}")
+    for name, func in variants.items():
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1e6)
+        allocated, blocks = _allocations(func)
+        print(f"{name:<12}{statistics.median(samples):>15.2f}{allocated:>10,}{blocks:>8}")
+
+
+def bench_session():
+    """Porównuje rozmiar stanu sesji: obiekty Runa vs kompaktowe zapisy losowań."""
+    import random
+    from models import Runa
+    from repository import get_repository
+    from session import draw_spread, resolve_spread, session_bytes
+    from supp import rune_id
+
+    layout = draw_spread("layout", 8)
+    celtic = draw_spread("celtic", 4)
+    uklad, _ = resolve_spread(layout)
+    records = get_repository().by_name
+    compact = {
+        "selected_layout": layout,
+        "Runa dnia": rune_id(random.choice(uklad)),
+        "selected_rune": rune_id(uklad[3]),
+        "celtic_spread": celtic,
+    }
+
+    # Dawny stan: obiekty Runa tworzone w każdym przebiegu, więc własne dla sesji
+    # (teksty run należą do repozytorium i nie są liczone w żadnym wariancie)
+    def fresh(runa):
+        return Runa.from_record(records[runa.nazwa])
+
+    celtic_runes, celtic_reversed = resolve_spread(celtic)
+    legacy = {
+        "selected_layout": [fresh(runa) for runa in uklad],
+        "Runa dnia": fresh(uklad[0]),
+        "selected_rune": fresh(uklad[3]),
+        "odwrocone_runy": celtic_reversed,
+    }
+
+    legacy_bytes = session_bytes(legacy)
+    compact_bytes = session_bytes(compact)
+    print(f"{'wariant':<16}{'bajty / sesję':>15}")
+    print(f"{'obiekty Runa':<16}{legacy_bytes:>15,}")
+    print(f"{'zapisy losowań':<16}{compact_bytes:>15,}")
+    print(f"Mniej o {legacy_bytes / compact_bytes:.0f}x (dawny stan bez układu krzyża - nie był zapisywany)")
+
+
+def _count_deltas(node):
+    """Liczy elementy i bloki drzewa strony - każdy z nich to osobna delta w przebiegu."""
+    children = getattr(node, "children", None)
+    if not isinstance(children, dict):
+        return 1
+    return 1 + sum(_count_deltas(child) for child in children.values())
+
+
+def bench_deltas(pages):
+    """Liczba delt wysyłanych w jednym przebiegu każdej strony (przeglądanie: 24 runy na stronę)."""
+    from streamlit.testing.v1 import AppTest
+
+    print(f"{'strona':<22}{'delty':>8}{'markdown':>10}")
+    for page in pages:
+        at = AppTest.from_file("app.py", default_timeout=120).run()
+        at = at.sidebar.selectbox[0].select(page).run()
+        if page == PAGES[0]:
+            at = at.selectbox(key="browse_page_size").select(max(BROWSE_PAGE_SIZES)).run()
+        elif at.button:
+            at = at.button[0].click().run()
+        print(f"{page:<22}{_count_deltas(at.main):>8}{len(at.markdown):>10}")
+
+
+# Wewnętrzne: importuje moduł i wypisuje pliki danych otwarte w trakcie importu
+_IMPORT_PROBE = """
+import os, sys, json
+root = os.getcwd()
+opened = []
+def hook(event, args):
+    if event == "open" and isinstance(args[0], str):
+        path = os.path.abspath(args[0])
+        if path.startswith(root) and not path.endswith((".py", ".pyc")) and not os.path.isdir(path):
+            opened.append(os.path.relpath(path, root))
+sys.addaudithook(hook)
+import {module}
+print(json.dumps(sorted(set(opened))))
+"""
+
+
+def _parse_importtime(stderr):
+    """Zwraca [(moduł, czas własny µs, czas łączny µs, głębokość)] z wyjścia -X importtime."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def bench_imports(module, top):
+    """Raport czasu importu (jak python -X importtime) i kontrola braku I/O przy imporcie."""
+    import json
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _IMPORT_PROBE.format(module=module)],
+        capture_output=True, text=True, check=True,
+    )
+    rows = _parse_importtime(result.stderr)
+    total = next((cumulative for name, _, cumulative, _ in rows if name == module), 0)
+    project = {os.path.splitext(f)[0] for f in os.listdir(".") if f.endswith(".py")}
+
+    print(f"Import {module}: {total / 1000:.1f} ms")
+    print(f"\n{'moduł projektu':<24}{'własny ms':>12}{'łączny ms':>12}")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda row: -row[2]):
+        if name in project:
+            print(f"{name:<24}{self_us / 1000:>12.1f}{cumulative_us / 1000:>12.1f}")
+
+    print(f"\n{'pakiet zewnętrzny':<24}{'łączny ms':>12}")
+    packages = [row for row in rows if "." not in row[0] and row[0] not in project and not row[0].startswith("_")]
+    for name, _, cumulative_us, _ in sorted(packages, key=lambda row: -row[2])[:top]:
+        print(f"{name:<24}{cumulative_us / 1000:>12.1f}")
+
+    opened = json.loads(result.stdout.strip().splitlines()[-1])
+    if opened:
+        print(f"\nPliki otwarte podczas importu ({len(opened)}): {', '.join(opened)}")
+        return 1
+    print("\nPodczas importu nie otwarto żadnych plików danych.")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiary wydajności Rune Witch")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    payload = subparsers.add_parser("payload", help="Rozmiar delty HTML: obrazy inline vs static")
+    payload.add_argument("--pages", nargs="+", default=PAGES, help="Strony do zmierzenia")
+
+    decode = subparsers.add_parser("decode", help="Pełne vs szybkie (DCT) dekodowanie JPEG")
+    decode.add_argument("--width", type=int, default=300, help="Docelowa szerokość obrazu")
+    decode.add_argument("--repeat", type=int, default=5, help="Liczba powtórzeń pomiaru")
+
+    peak = subparsers.add_parser("decode-peak")
+    peak.add_argument("mode", choices=["none", "full", "fast"])
+    peak.add_argument("--width", type=int, default=300)
+
+    batch = subparsers.add_parser("batch", help="Przygotowanie obrazów układu: kolejno vs równolegle")
+    batch.add_argument("--runes", type=int, default=8, help="Liczba run w układzie")
+    batch.add_argument("--workers", type=int, default=4, help="Rozmiar puli")
+
+    startup = subparsers.add_parser("startup", help="Zimny start danych run: JSON vs snapshot")
+    startup.add_argument("--repeat", type=int, default=5, help="Liczba uruchomień procesu")
+
+    startup_child_parser = subparsers.add_parser("startup-child")
+    startup_child_parser.add_argument("mode", choices=["json", "snapshot"])
+
+    reruns = subparsers.add_parser("reruns", help="Koszt listy run w każdym przebiegu skryptu")
+    reruns.add_argument("--repeat", type=int, default=1000, help="Liczba powtórzeń pomiaru")
+
+    subparsers.add_parser("session", help="Rozmiar stanu sesji: obiekty Runa vs zapisy losowań")
+
+    deltas = subparsers.add_parser("deltas", help="Liczba delt w jednym przebiegu strony")
+    deltas.add_argument("--pages", nargs="+", default=PAGES, help="Strony do zmierzenia")
+
+    imports = subparsers.add_parser("imports", help="Czas importu modułów i kontrola I/O przy imporcie")
+    imports.add_argument("--module", default="app", help="Importowany moduł")
+    imports.add_argument("--top", type=int, default=15, help="Liczba najcięższych pakietów")
+
+    args = parser.parse_args(argv)
+    if args.command == "batch":
+        bench_batch(args.runes, args.workers)
+    elif args.command == "payload":
+        bench_payload(args.pages)
+    elif args.command == "decode":
+        return bench_decode(args.width, args.repeat)
+    elif args.command == "decode-peak":
+        decode_peak(args.mode, args.width)
+    elif args.command == "startup":
+        return bench_startup(args.repeat)
+    elif args.command == "startup-child":
+        startup_child(args.mode)
+    elif args.command == "reruns":
+        bench_reruns(args.repeat)
+    elif args.command == "session":
+        bench_session()
+    elif args.command == "deltas":
+        bench_deltas(args.pages)
+    elif args.command == "imports":
+        return bench_imports(args.module, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
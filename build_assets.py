@@ -0,0 +1,244 @@
+#?##########################################################################################################
+#TODO "build_assets.py" - budowanie gotowych zasobów aplikacji (offline)
+#?##########################################################################################################
+"""
+Przygotowuje zasoby przed uruchomieniem aplikacji, żeby praca PIL nie odbywała
+się w trakcie obsługi użytkowników.
+
+Użycie (z katalogu głównego projektu):
+    python build_assets.py images [--force]
+    python build_assets.py atlas [--sizes 300 500]
+    python build_assets.py snapshot
+"""
+
+import os
+import sys
+import json
+import hashlib
+import math
+import argparse
+from PIL import Image
+
+from constants import (
+    MAIN_PATH, CACHE_PATH, DATA_PATH, ASSET_MANIFEST_PATH, ATLAS_MAP_PATH, CORPUS_SNAPSHOT_PATH,
+    RUNE_VARIANT_SIZES, INTERACTIVE_WIDTH, BANNERS,
+)
+from assets import MANIFEST_VERSION, ATLAS_VERSION, StaticImageStore, atlas_key, variant_name
+from models import ImageProcessor
+from repository import build_snapshot, get_repository
+from supp import create_runes_list
+
+
+# Układ atlasu: kolumny siatki i odstęp między kafelkami (chroni przed "przeciekaniem" sąsiadów)
+ATLAS_COLUMNS = 6
+ATLAS_PADDING = 4
+
+
+def sha256_file(path):
+    """Zwraca skrót SHA-256 zawartości pliku."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def write_atomic(path, data):
+    """Zapisuje plik przez plik tymczasowy, żeby aplikacja nie odczytała połowy."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_manifest():
+    """Wczytuje istniejący manifest lub zwraca pusty."""
+    try:
+        with open(ASSET_MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "variants": {}}
+
+
+def render_banner(source_path, size):
+    """Skaluje obraz główny do wymiarów banera tak jak supp.HeroImageService."""
+    with Image.open(source_path) as img:
+        img = img.convert("RGB").resize(size)
+    return ImageProcessor.to_jpeg_bytes(img)
+
+
+def image_sources():
+    """Zwraca obrazy, których używa aplikacja: pliki run z repozytorium i skalowane banery."""
+    runes = [record.obraz for record in get_repository().records]
+    banners = [(os.path.join(MAIN_PATH, f"{name}.jpg"), size) for name, size in BANNERS.items() if size]
+    return runes, banners
+
+
+def build_images(force=False):
+    """
+    Buduje warianty run (wszystkie rozmiary, obie orientacje) i banerów.
+
+    Wpisy manifestu (i ich pliki), których źródło lub rozmiar nie są już
+    używane, są usuwane.
+    """
+    manifest = load_manifest()
+    variants = manifest["variants"]
+    rune_sizes = list(dict.fromkeys(RUNE_VARIANT_SIZES))
+    rune_sources, banner_sources = image_sources()
+
+    jobs = []
+    for source in rune_sources:
+        for size in rune_sizes:
+            for is_reversed in (False, True):
+                jobs.append((source, size, is_reversed, "fit"))
+    for source, size in banner_sources:
+        jobs.append((source, size, False, "banner"))
+
+    missing = sorted({source for source, *_ in jobs if not os.path.exists(source)})
+    for source in missing:
+        print(f"Pominięto {source}: brak pliku")
+    jobs = [job for job in jobs if job[0] not in missing]
+
+    built = skipped = 0
+    source_hashes = {}
+    for source, size, is_reversed, mode in jobs:
+        name = variant_name(source, size, is_reversed)
+        output_path = os.path.join(CACHE_PATH, name)
+        stat = os.stat(source)
+        if source not in source_hashes:
+            source_hashes[source] = sha256_file(source)
+        source_hash = source_hashes[source]
+
+        entry = variants.get(name)
+        if (not force and entry and entry["source_sha256"] == source_hash
+                and os.path.exists(output_path)):
+            # Treść bez zmian - aktualizujemy tylko znacznik czasu źródła
+            entry["source_mtime"] = stat.st_mtime
+            entry["source_size"] = stat.st_size
+            skipped += 1
+            continue
+
+        if mode == "banner":
+            data = render_banner(source, size)
+        else:
+            data = ImageProcessor.render_jpeg(source, size, is_reversed)
+        if not data:
+            print(f"Pominięto {name}: nie można przetworzyć {source}")
+            continue
+
+        write_atomic(output_path, data)
+        variants[name] = {
+            "file": name,
+            "source": os.path.relpath(source, os.path.dirname(CACHE_PATH)).replace(os.sep, "/"),
+            "source_sha256": source_hash,
+            "source_mtime": stat.st_mtime,
+            "source_size": stat.st_size,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "width": size[0],
+            "height": size[1],
+            "reversed": is_reversed,
+            "bytes": len(data),
+        }
+        built += 1
+
+    # Nieużywane wpisy: źródła usunięte z aplikacji, rozmiary spoza RUNE_VARIANT_SIZES
+    expected = {variant_name(source, size, is_reversed) for source, size, is_reversed, _ in jobs}
+    stale = [name for name in variants if name not in expected]
+    for name in stale:
+        try:
+            os.remove(os.path.join(CACHE_PATH, variants.pop(name)["file"]))
+        except OSError:
+            pass
+
+    write_atomic(ASSET_MANIFEST_PATH, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    print(f"Warianty obrazów: zbudowano {built}, bez zmian {skipped}, usunięto {len(stale)}, razem {len(variants)}")
+    print(f"Manifest: {ASSET_MANIFEST_PATH}")
+
+
+def build_atlas(sizes):
+    """Składa obrazy 24 run w jeden atlas na każdy rozmiar i orientację oraz zapisuje mapę współrzędnych."""
+    runy = create_runes_list()
+    store = StaticImageStore(folder="atlas")
+    atlases = {}
+
+    for width in sizes:
+        for is_reversed in (False, True):
+            rows = math.ceil(len(runy) / ATLAS_COLUMNS)
+            cell = width + ATLAS_PADDING
+            canvas = Image.new("RGB", (ATLAS_COLUMNS * cell, rows * cell), (0, 0, 0))
+            tiles = {}
+
+            for i, runa in enumerate(runy):
+                img = ImageProcessor.open_image(runa.obraz, (width, width))
+                img = ImageProcessor.resize_image(img, width, width)
+                if img is None:
+                    print(f"Pominięto {runa.nazwa}: nie można przetworzyć {runa.obraz}")
+                    continue
+                if is_reversed:
+                    img = img.rotate(180)
+                x = (i % ATLAS_COLUMNS) * cell
+                y = (i // ATLAS_COLUMNS) * cell
+                canvas.paste(img, (x, y))
+                stat = os.stat(runa.obraz)
+                tiles[runa.nazwa] = {
+                    "x": x, "y": y, "w": img.width, "h": img.height,
+                    "source": os.path.relpath(runa.obraz, DATA_PATH).replace(os.sep, "/"),
+                    "source_mtime": stat.st_mtime,
+                    "source_size": stat.st_size,
+                }
+
+            data = ImageProcessor.to_jpeg_bytes(canvas)
+            atlases[atlas_key(width, is_reversed)] = {
+                "url": store.publish(data),
+                "width": canvas.width,
+                "height": canvas.height,
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "tiles": tiles,
+            }
+            print(f"Atlas {atlas_key(width, is_reversed)}: {len(tiles)} run, "
+                  f"{canvas.width}x{canvas.height}, {len(data):,} B")
+
+    atlas_map = {"version": ATLAS_VERSION, "atlases": atlases}
+    write_atomic(ATLAS_MAP_PATH, json.dumps(atlas_map, ensure_ascii=False, indent=2).encode("utf-8"))
+    print(f"Mapa atlasów: {ATLAS_MAP_PATH}")
+
+
+def build_corpus_snapshot():
+    """Sprawdza pliki danych run i zapisuje ich snapshot do szybkiego startu aplikacji."""
+    try:
+        data = build_snapshot()
+    except ValueError as e:
+        print(f"Nie zbudowano snapshotu: {e}")
+        return 1
+    write_atomic(CORPUS_SNAPSHOT_PATH, data)
+    print(f"Snapshot danych run: {len(data):,} B")
+    print(f"Snapshot: {CORPUS_SNAPSHOT_PATH}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Budowanie gotowych zasobów Rune Witch")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    images = subparsers.add_parser("images", help="Warianty obrazów run i banerów w data/cache")
+    images.add_argument("--force", action="store_true", help="Przebuduj wszystkie warianty")
+
+    atlas = subparsers.add_parser("atlas", help="Atlas 24 run (obraz + mapa współrzędnych)")
+    atlas.add_argument("--sizes", nargs="+", type=int, default=[INTERACTIVE_WIDTH],
+                       help="Szerokości kafelków w pikselach")
+
+    subparsers.add_parser("snapshot", help="Sprawdzony snapshot danych run (marshal) w data/cache")
+
+    args = parser.parse_args(argv)
+    if args.command == "images":
+        build_images(force=args.force)
+    elif args.command == "atlas":
+        build_atlas(args.sizes)
+    elif args.command == "snapshot":
+        return build_corpus_snapshot()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
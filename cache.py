@@ -0,0 +1,143 @@
+###########################################################################
+#! "cache" - współdzielone pamięci podręczne procesu
+###########################################################################
+
+import os
+import time
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Pamięć podręczna LRU ograniczona rozmiarem w bajtach.
+
+    Jedna instancja jest współdzielona przez wszystkie sesje w procesie,
+    dlatego operacje są chronione blokadą.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Zwraca wartość dla klucza lub None, aktualizując liczniki."""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Zapisuje wartość i usuwa najdawniej używane wpisy ponad limit."""
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._items[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        """Zwraca wartość z pamięci lub tworzy ją funkcją `factory` i zapisuje."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            if value:
+                self.put(key, value)
+        return value
+
+    def clear(self):
+        """Czyści pamięć i zeruje liczniki."""
+        with self._lock:
+            self._items.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Zwraca statystyki pamięci podręcznej."""
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._items)
+
+
+class WatchedFile:
+    """Dane wczytane z pliku i przeładowywane, gdy plik naprawdę się zmieni.
+
+    Stan pliku (mtime i rozmiar) jest sprawdzany najwyżej co `check_interval`
+    sekund, więc częste odczyty kosztują tylko porównanie czasu.
+    """
+
+    def __init__(self, path, loader, check_interval=30.0, clock=time.monotonic, initial=None):
+        self.path = path
+        self.loader = loader
+        self.check_interval = check_interval
+        self.clock = clock
+        self.loads = 0
+        self.reloads = 0
+        self.failures = 0
+        self._value = None
+        self._signature = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+        if initial is not None:
+            # Dane wczytane już inną drogą (np. ze snapshotu) odpowiadają bieżącemu plikowi
+            self._value = initial
+            self._signature = self._file_signature()
+            self._checked_at = clock()
+            self.loads = 1
+
+    def _file_signature(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self):
+        """Zwraca aktualne dane, przeładowując je po zmianie pliku."""
+        now = self.clock()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self._value
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return self._value
+            try:
+                signature = self._file_signature()
+                if signature != self._signature:
+                    self._value = self.loader(self.path)
+                    if self._signature is not None:
+                        self.reloads += 1
+                    self.loads += 1
+                    self._signature = signature
+            except (OSError, ValueError) as e:
+                # Plik w trakcie zapisu, usunięty lub błędny - zostają ostatnie dobre dane,
+                # a kolejna próba odbędzie się dopiero po check_interval
+                self.failures += 1
+                print(f"Nie przeładowano {self.path}: {e}")
+            self._checked_at = now
+            return self._value
+
+    def stats(self):
+        """Zwraca liczbę wczytań i przeładowań pliku."""
+        return {"loads": self.loads, "reloads": self.reloads, "failures": self.failures,
+                "check_interval": self.check_interval}
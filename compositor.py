@@ -0,0 +1,118 @@
+###########################################################################
+#! "compositor" - cały wylosowany układ run jako jeden obraz JPEG (PIL)
+###########################################################################
+
+import io
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+from constants import (COLORS, INTERACTIVE_WIDTH, SPREAD_IMAGE_CACHE_MAX_BYTES, SPREAD_FONTS,
+                       IMAGE_BATCH_EXECUTOR, IMAGE_BATCH_WORKERS)
+from cache import LRUCache
+from models import ImageProcessor
+from session import resolve_spread
+from text import strip_diacritics
+
+
+# Wspólna dla wszystkich sesji pamięć złożonych obrazów układów
+SPREAD_IMAGE_CACHE = LRUCache(SPREAD_IMAGE_CACHE_MAX_BYTES)
+
+# Wygląd obrazu: odstępy wokół kafelka, czcionki podpisów i ramka run odwróconych
+TILE_PADDING = 24
+LINE_GAP = 6
+LABEL_FONT_SIZE = 18
+NAME_FONT_SIZE = 15
+REVERSED_BORDER = (230, 0, 46)  # hsl(349, 100%, 45%) jak w HTML
+REVERSED_BORDER_WIDTH = 5
+
+
+@lru_cache(maxsize=None)
+def _fonts():
+    """
+    Zwraca (czcionka etykiet, czcionka nazw, czy czcionka ma polskie znaki).
+
+    Wbudowana czcionka PIL nie ma polskich liter, więc korzystamy z pierwszej
+    dostępnej czcionki z SPREAD_FONTS, a bez niej podpisy tracą znaki diakrytyczne.
+    """
+    for path in SPREAD_FONTS:
+        try:
+            return ImageFont.truetype(path, LABEL_FONT_SIZE), ImageFont.truetype(path, NAME_FONT_SIZE), True
+        except OSError:
+            continue
+    print("Brak czcionki TrueType dla obrazów układów - podpisy bez polskich znaków")
+    return ImageFont.load_default(size=LABEL_FONT_SIZE), ImageFont.load_default(size=NAME_FONT_SIZE), False
+
+
+def wrap_text(text, font, width):
+    """Dzieli tekst na wiersze nie szersze niż `width` pikseli."""
+    lines = []
+    for word in text.split():
+        if lines and font.getlength(f"{lines[-1]} {word}") <= width:
+            lines[-1] = f"{lines[-1]} {word}"
+        else:
+            lines.append(word)
+    return lines
+
+
+def load_tiles(uklad, odwrocone, tile=INTERACTIVE_WIDTH):
+    """Wczytuje przeskalowane (i obrócone) kafelki run równolegle, jako bajty JPEG."""
+    pool = ImageProcessor._get_executor(IMAGE_BATCH_EXECUTOR, IMAGE_BATCH_WORKERS)
+    size = (tile, tile)
+    results = list(pool.map(ImageProcessor.load_jpeg_timed, [runa.obraz for runa in uklad],
+                            [size] * len(uklad), list(odwrocone)))
+    ImageProcessor.report_errors([timings for _, timings in results])
+    return [data for data, _ in results]
+
+
+def render_spread_image(spread, uklad, odwrocone, tile=INTERACTIVE_WIDTH):
+    """Składa kafelki run na jednym płótnie według siatki układu i zwraca bajty JPEG."""
+    label_font, name_font, polish = _fonts()
+    caption = (lambda text: text) if polish else strip_diacritics
+    cell_width = tile + 2 * TILE_PADDING
+    labels = [wrap_text(caption(position.label), label_font, cell_width - TILE_PADDING)
+              for position in spread.positions]
+    names = [caption(runa.get_nazwa_odwrocona() if odwrocona else runa.nazwa)
+             for runa, odwrocona in zip(uklad, odwrocone)]
+
+    label_height = label_font.size + LINE_GAP
+    text_height = max(len(lines) for lines in labels) * label_height + name_font.size + LINE_GAP
+    cell_height = tile + text_height + 2 * TILE_PADDING
+    rows = max(position.row for position in spread.positions)
+
+    canvas = Image.new("RGB", (spread.columns * cell_width, rows * cell_height), COLORS["background"])
+    draw = ImageDraw.Draw(canvas)
+
+    for position, data, odwrocona, lines, nazwa in zip(spread.positions, load_tiles(uklad, odwrocone, tile),
+                                                        odwrocone, labels, names):
+        left = (position.col - 1) * cell_width + TILE_PADDING
+        top = (position.row - 1) * cell_height + TILE_PADDING
+        center = left + tile // 2
+
+        if data:
+            with Image.open(io.BytesIO(data)) as img:
+                img = img.convert("RGB")
+            x, y = left + (tile - img.width) // 2, top + (tile - img.height) // 2
+            canvas.paste(img, (x, y))
+            if odwrocona:
+                draw.rectangle((x, y, x + img.width - 1, y + img.height - 1),
+                               outline=REVERSED_BORDER, width=REVERSED_BORDER_WIDTH)
+
+        text_top = top + tile + LINE_GAP
+        for line in lines:
+            draw.text((center, text_top), line, font=label_font, fill=COLORS["accent"], anchor="ma")
+            text_top += label_height
+        draw.text((center, text_top), nazwa, font=name_font, fill=COLORS["text"], anchor="ma")
+
+    return ImageProcessor.to_jpeg_bytes(canvas)
+
+
+def compose_spread(spread, record, tile=INTERACTIVE_WIDTH):
+    """
+    Zwraca obraz zapisanego układu (bajty JPEG) z pamięci podręcznej lub składa go i zapamiętuje.
+
+    Kluczem jest (rodzaj układu, numery run, maska odwróceń, rozmiar kafelka),
+    więc ten sam wylosowany układ jest kodowany tylko raz dla wszystkich sesji.
+    """
+    key = (record.kind, record.ids, record.reversed_mask, tile)
+    return SPREAD_IMAGE_CACHE.get_or_create(key, lambda: render_spread_image(spread, *resolve_spread(record), tile))
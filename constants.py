@@ -2,19 +2,47 @@
 #! "constants" - wszystkie stałe programu
 
 import os
-from dotenv import load_dotenv
-import openai
 
 
 # Ścieżki dostępu
 BASE_PATH = os.getcwd()
 MAIN_PATH = os.path.join(BASE_PATH, "data", "img_main")
 RUNE_PATH = os.path.join(BASE_PATH, "data", "img_rune")
+DATA_PATH = os.path.join(BASE_PATH, "data")
+
+# Gotowe warianty obrazów budowane przez build_assets.py
+CACHE_PATH = os.path.join(BASE_PATH, "data", "cache")
+ASSET_MANIFEST_PATH = os.path.join(CACHE_PATH, "manifest.json")
+ATLAS_MAP_PATH = os.path.join(CACHE_PATH, "atlas.json")
+CORPUS_SNAPSHOT_PATH = os.path.join(CACHE_PATH, "corpus.marshal")
+SEARCH_INDEX_PATH = os.path.join(CACHE_PATH, "search.marshal")
+SIMILARITY_PATH = os.path.join(CACHE_PATH, "similarity.npz")
+# Stan rozgrzewania: osobny plik na proces serwera (port), chyba że podano RUNE_WARMUP_STATUS
+WARMUP_STATUS_PATH = os.getenv("RUNE_WARMUP_STATUS")
+WARMUP_STATUS_TEMPLATE = os.path.join(CACHE_PATH, "warmup-{port}.json")
+DEFAULT_SERVER_PORT = 8501
+
+# Statyczne pliki serwowane przez Streamlit (server.enableStaticServing) - katalog obok app.py
+STATIC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "app/static"
 
 
 # Ścieżki do plików JSON
 DATA_MAIN_PATH = os.path.join(BASE_PATH, "data", "processed", "big_data_rune.json")
 DATA_FRONT_PATH = os.path.join(BASE_PATH, "data", "processed", "front_data_rune.json")
+DATA_DAILY_PATH = os.path.join(BASE_PATH, "data", "processed", "daily_data_rune.json")
+
+# Co ile sekund (najwyżej) sprawdzać, czy plik runy dnia zmienił się na dysku
+DAILY_RELOAD_INTERVAL = float(os.getenv("RUNE_DAILY_RELOAD_SECONDS", "30"))
+
+# Standardowa kolejność run w Futharku
+FUTHARK_ORDER = [
+    "Fehu", "Uruz", "Thurisaz", "Ansuz", "Raidho",
+    "Kenaz", "Gebo", "Wunjo", "Hagalaz", "Nauthiz",
+    "Isa", "Jera", "Eihwaz", "Perthro", "Algiz",
+    "Sowilo", "Tiwaz", "Berkano", "Ehwaz", "Mannaz",
+    "Laguz", "Ingwaz", "Dagaz", "Othala"
+]
 
 # Stałe kolorystyczne
 COLORS = {
@@ -28,6 +56,12 @@ COLORS = {
 IMG_WIDTH = 1080
 IMG_HEIGHT = 600
 
+# Nazwane banery z folderu img_main i ich docelowe rozmiary (None - oryginalny plik)
+BANNERS = {
+    "maina": (IMG_WIDTH, IMG_HEIGHT),
+    "volva3": None,
+}
+
 # Minimalne wymiary dla run 300x300
 MIN_WIDTH = 300
 MIN_HEIGHT = 300
@@ -36,6 +70,61 @@ MIN_HEIGHT = 300
 MAX_WIDTH = 500
 MAX_HEIGHT = 500
 
+# Obraz interaktywny (przeglądanie, rozkłady) i obraz runy dnia
+INTERACTIVE_WIDTH = 300
+DAILY_WIDTH = 800
+
+# Wszystkie rozmiary run, o które prosi aplikacja (budowane offline w obu orientacjach)
+RUNE_VARIANT_SIZES = [
+    (MIN_WIDTH, MIN_HEIGHT),
+    (MAX_WIDTH, MAX_HEIGHT),
+    (INTERACTIVE_WIDTH, INTERACTIVE_WIDTH),
+    (DAILY_WIDTH, DAILY_WIDTH),
+]
+
+# Szybkie dekodowanie JPEG w zmniejszonej skali (PIL draft), 0 wyłącza
+FAST_DECODE = os.getenv("RUNE_FAST_DECODE", "1") == "1"
+# Maksymalna średnia różnica pikseli (0-255) szybkiej ścieżki względem pełnego dekodowania
+FAST_DECODE_MAX_MEAN_DIFF = 3.0
+
+# Równoległe przygotowanie obrazów układów: rodzaj puli ("thread" / "process") i jej rozmiar
+IMAGE_BATCH_EXECUTOR = os.getenv("RUNE_BATCH_EXECUTOR", "thread")
+IMAGE_BATCH_WORKERS = int(os.getenv("RUNE_BATCH_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Rozgrzewanie pamięci podręcznych w tle przy starcie procesu (warmup.py), 1 włącza
+WARMUP_ENABLED = os.getenv("RUNE_WARMUP", "0") == "1"
+
+# Limit pamięci podręcznej banerów stron (w MB, domyślnie 16)
+HERO_CACHE_MAX_BYTES = int(os.getenv("RUNE_HERO_CACHE_MB", "16")) * 1024 * 1024
+
+# Szansa na odwróconą runę przy losowaniu
+REVERSE_CHANCE = 0.33
+
+# Przeglądanie run: dostępne liczby run na stronę (pierwsza jest domyślna)
+BROWSE_PAGE_SIZES = [4, 8, 12, 24]
+
+# Liczba run w panelu "Powiązane runy"
+RELATED_RUNES_COUNT = 3
+
+# Wylosowane układy: jeden złożony obraz JPEG ("image") albo siatka osobnych obrazów run ("grid")
+SPREAD_RENDER_MODE = os.getenv("RUNE_SPREAD_MODE", "image")
+
+# Czcionki TrueType podpisów na obrazie układu (pierwsza dostępna; bez nich - wbudowana czcionka PIL)
+SPREAD_FONTS = [path for path in [os.getenv("RUNE_SPREAD_FONT"), "DejaVuSans.ttf",
+                                  "LiberationSans-Regular.ttf", "Arial.ttf"] if path]
+
+# Limit pamięci podręcznej złożonych obrazów układów (w MB, domyślnie 16)
+SPREAD_IMAGE_CACHE_MAX_BYTES = int(os.getenv("RUNE_SPREAD_CACHE_MB", "16")) * 1024 * 1024
+
+# Limit pamięci podręcznej HTML siatek układów w trybie "grid" (w MB, domyślnie 16)
+SPREAD_HTML_CACHE_MAX_BYTES = int(os.getenv("RUNE_SPREAD_HTML_CACHE_MB", "16")) * 1024 * 1024
+
+# Sposób osadzania obrazów: "inline" (base64 w HTML) lub "static" (adresy URL plików)
+IMAGE_RENDER_MODE = os.getenv("RUNE_IMAGE_MODE", "inline")
+
+# Limit pamięci podręcznej przetworzonych obrazów (w MB, domyślnie 64)
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("RUNE_IMAGE_CACHE_MB", "64")) * 1024 * 1024
+
 # # ------------------------------------------------------------------------------
 # # KONFIGURACJA API I MODELI
 # # ------------------------------------------------------------------------------
@@ -0,0 +1,42 @@
+###########################################################################
+#! "draw" - losowanie run z jawnym ziarnem (powtarzalne i możliwe do zapamiętania)
+###########################################################################
+
+import random
+import secrets
+import datetime
+from functools import lru_cache
+
+from models import ImageProcessor
+
+
+def new_seed():
+    """Nowe losowe ziarno dla jednego losowania (np. układu run)."""
+    return secrets.randbits(63)
+
+
+def daily_seed(day=None, salt=""):
+    """Ziarno runy dnia: data i opcjonalna sól użytkownika (np. imię)."""
+    day = day or datetime.date.today()
+    salt = " ".join(salt.split()).lower()
+    return f"{day.isoformat()}|{salt}" if salt else day.isoformat()
+
+
+def draw_runes(count, seed, population):
+    """
+    Losuje `count` różnych pozycji z `population` run wraz z orientacjami.
+
+    Wynik zależy wyłącznie od ziarna: (lista numerów, lista odwróceń).
+    Ziarna tekstowe dają ten sam wynik w każdym procesie.
+    """
+    rng = random.Random(seed)
+    numery = rng.sample(range(population), count)
+    odwrocone = [ImageProcessor.choose_orientation(random_orientation=True, rng=rng) for _ in numery]
+    return numery, odwrocone
+
+
+@lru_cache(maxsize=256)
+def daily_rune(day, salt, population):
+    """Numer runy dnia dla daty i soli - liczony raz i wspólny dla wszystkich sesji."""
+    (numer,), _ = draw_runes(1, daily_seed(day, salt), population)
+    return numer
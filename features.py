@@ -2,14 +2,18 @@
 #! features.py - Funkcje związane z funkcjonalnościami aplikacji runicznych
 ###########################################################################
 
-import random
 import streamlit as st
 from PIL import Image
-from supp import losuj_rune, load_main_images
+from supp import losuj_rune, load_main_images, rune_id, rune_by_id
+from session import SpreadRecord, draw_spread, resolve_spread
+from spreads import SPREADS, LAYOUT_SPREADS, Spread, spread_for, render_spread
 from models import RunaPelna, Runa
-from constants import COLORS
-import json
+from repository import get_repository
+from search import get_search_index
+from templates import rune_details_html, rune_header_html, related_runes_html, SPACER
+from constants import COLORS, BROWSE_PAGE_SIZES
 import os
+import time
 
 
 
@@ -41,67 +45,109 @@ def display_browse_runes(runy: list[RunaPelna]) -> None:
         unsafe_allow_html=True,
     )
 
+    # Filtr aettu i rozmiar strony - renderujemy tylko widoczne runy
+    aetty = ["Wszystkie"] + list(dict.fromkeys(runa.aett for runa in runy if runa.aett))
+    col_aett, col_size = st.columns([2, 1])
+    with col_aett:
+        aett = st.selectbox("Aett", aetty, key="browse_aett", on_change=_reset_browse_cursor)
+    with col_size:
+        page_size = st.selectbox("Run na stronę", BROWSE_PAGE_SIZES, key="browse_page_size",
+                                 on_change=_reset_browse_cursor)
+
+    wybrane = [runa for runa in runy if aett == "Wszystkie" or runa.aett == aett]
+    limit = st.session_state.get("browse_cursor", page_size)
+
     st.subheader("", divider="rainbow")
-    for runa in runy:
+    for runa in wybrane[:limit]:
         st.markdown('<div style="height: 20px;"></div>', unsafe_allow_html=True)
         display_rune_info(runa)
         st.header("", divider="rainbow")
 
+    if limit < len(wybrane):
+        st.button(
+            f"Pokaż więcej run ({len(wybrane) - limit} pozostało)",
+            use_container_width=True,
+            on_click=_load_more_runes,
+            args=(limit, page_size),
+        )
+
+def _reset_browse_cursor() -> None:
+    """Po zmianie filtra lub rozmiaru strony zaczynamy od pierwszej strony."""
+    st.session_state.pop("browse_cursor", None)
+
+def _load_more_runes(limit: int, page_size: int) -> None:
+    """Przesuwa kursor przeglądania o jedną stronę."""
+    st.session_state["browse_cursor"] = limit + page_size
+
 def display_rune_info(runa: Runa) -> None:
     """Wyświetla szczegółowe informacje o pojedynczej runie."""
     # Górna część z obrazem i nazwą
     col1, col2 = st.columns([1, 1])
     
     with col1:
-        st.markdown(
-            f"<h1 style='color: {COLORS['accent']}; font-size: 66px;'>{runa.nazwa}</h1>",
-            unsafe_allow_html=True
-        )
-        # Wyświetl symbol, aett i pozycję w pierwszej kolumnie z większą czcionką i przerwą
-        st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 30px;'>Symbol:&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;<span style='color: {COLORS['text']}; font-weight: bold;'>{runa.symbol}</span></p>", unsafe_allow_html=True)
-        st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 30px;'>Aett:&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;<span style='color: {COLORS['text']}; font-weight: bold;'>{runa.aett}</span></p>", unsafe_allow_html=True)
-        st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 30px;'>Pozycja:&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;<span style='color: {COLORS['text']}; font-weight: bold;'>{runa.pozycja}</span></p>", unsafe_allow_html=True)
+        # Nazwa, symbol, aett i pozycja jednym blokiem HTML
+        st.markdown(rune_header_html(rune_id(runa)), unsafe_allow_html=True)
 
     with col2:
         st.markdown('<div style="height: 20px;"></div>', unsafe_allow_html=True)
         runa.pokaz_interaktywny_obraz()
     
-    # Dolna część z detalami rozciągnięta na całą szerokość
-    st.markdown('<div style="height: 20px;"></div>', unsafe_allow_html=True)
-    display_rune_details(runa, show_all=False)
+    # Dolna część z detalami rozciągnięta na całą szerokość - odstęp, opis i powiązane runy jedną deltą
+    numer = rune_id(runa)
+    st.markdown(SPACER + rune_details_html(numer, show_all=False) + related_runes_html(numer),
+                unsafe_allow_html=True)
 
 def display_rune_details(runa: Runa, show_all: bool = True) -> None:
     """Wyświetla szczegółowe dane o runie w ustandaryzowanym formacie."""
-    if show_all:
-        sections = {
-            "Symbol": runa.symbol,
-            "Aett": runa.aett,
-            "Pozycja": runa.pozycja,
-            "Znaczenie": runa.znaczenie,
-            "Symbolika": runa.symbolika,
-            "Potencjał": runa.potencjal,
-            "Praktyczne zastosowanie": runa.prakt_zastosowanie,
-            "Dodatkowe informacje": runa.dodatkowe_info
-        }
-    else:
-        sections = {
-            "Znaczenie": runa.znaczenie,
-            "Symbolika": runa.symbolika,
-            "Potencjał": runa.potencjal
-        }
-    
-    for section, content in sections.items():
-        if not content:
-            continue
-        st.markdown(f"<h4 style='color: {COLORS['accent']};'>{section}</h4>", unsafe_allow_html=True)
-        if isinstance(content, dict):
-            for key, value in content.items():
-                st.markdown(f"<p style='color: {COLORS['text']};'>▪️ <b>{key}:</b> {value}</p>", unsafe_allow_html=True)
-        elif isinstance(content, list):
-            for item in content:
-                st.markdown(f"<p style='color: {COLORS['text']};'>▪️ {item}</p>", unsafe_allow_html=True)
-        else:
-            st.markdown(f"<p style='color: {COLORS['text']};'>{content}</p>", unsafe_allow_html=True)
+    # Jeden blok HTML z gotowych szablonów zamiast osobnej delty na każdy nagłówek i element
+    st.markdown(rune_details_html(rune_id(runa), show_all), unsafe_allow_html=True)
+
+def display_related_runes(runa: Runa) -> None:
+    """Wyświetla runy najbardziej powiązane z podaną (wg podobieństwa opisów)."""
+    if html := related_runes_html(rune_id(runa)):
+        st.markdown(html, unsafe_allow_html=True)
+
+#?##########################################################################################################
+#TODO#######################################################################################################
+#?                                                  Wyszukiwanie
+
+def display_search(runy: list[RunaPelna]) -> None:
+    """Wyszukiwanie pełnotekstowe w opisach run z podświetlonymi fragmentami."""
+    st.markdown(
+        f"""
+        <h1 style="font-size: 53px; font-weight: bold; text-align: center; color: {COLORS['accent']};">
+        Szukaj w runach
+        </h1>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    query = st.text_input("Czego szukasz?", key="search_query", placeholder="np. ochrona, miłość, podróż")
+    if not query.strip():
+        return
+
+    index = get_search_index()
+    start = time.perf_counter()
+    hits = index.search(query, limit=10)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    st.caption(f"Znaleziono run: {len(hits)} ({elapsed_ms:.2f} ms)")
+    if not hits:
+        st.info("Brak wyników - spróbuj innego słowa.")
+        return
+
+    st.subheader("", divider="rainbow")
+    for hit in hits:
+        st.markdown(
+            f"""
+            <div class="search-hit">
+                <h4 style="color: {COLORS['accent']}; margin-bottom: 0;">{hit.nazwa}
+                    <span style="color: {COLORS['text']}; font-size: 16px;">· {hit.field}</span></h4>
+                <p style="color: {COLORS['text']};">{hit.snippet}</p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
 
 #?##########################################################################################################
 #TODO#######################################################################################################
@@ -122,9 +168,13 @@ def display_rune_of_the_day(runy: list[RunaPelna]) -> None:
         st.image(main_image, use_container_width=True)
     st.markdown('<div style="height: 40px;"></div>', unsafe_allow_html=True)
 
+    # Opcjonalna sól: ta sama data i ten sam tekst zawsze dają tę samą runę
+    salt = st.text_input("Twoje imię lub intencja (opcjonalnie)", key="daily_salt",
+                         help="Runa dnia zależy od daty i tego tekstu - przez cały dzień pozostaje ta sama")
+
     # Button above the divider, outside of columns
     if st.button("**Wylosuj runę dnia**", use_container_width=True, type="primary"):
-        losuj_rune(runy)
+        losuj_rune(runy, salt)
 
     st.subheader("", divider="rainbow")
 
@@ -138,16 +188,13 @@ def display_rune_of_the_day(runy: list[RunaPelna]) -> None:
     # )
     # Display the rune if it exists in session state
     if "Runa dnia" in st.session_state:
-        runa = st.session_state["Runa dnia"]
+        runa = rune_by_id(st.session_state["Runa dnia"])
         display_daily_rune(runa)
 
 def display_daily_rune(runa: RunaPelna) -> None:
     """Wyświetla szczegóły runy dnia."""
-    # Load daily rune data
-    with open("data/processed/daily_data_rune.json", "r", encoding="utf-8") as f:
-        daily_data = json.load(f)
-    
-    rune_data = daily_data.get(runa.nazwa, {})
+    # Dane runy dnia ze wspólnej pamięci procesu (przeładowywane po zmianie pliku)
+    rune_data = get_repository().daily_for(runa.nazwa)
     
     st.markdown(
         f"""
@@ -226,14 +273,7 @@ def display_daily_rune(runa: RunaPelna) -> None:
                 <p style="color: {COLORS['text']}; font-size: 16px; margin-bottom: 20px;"><strong>{zadanie['krótkie_zadanie']}</strong></p>
             """, unsafe_allow_html=True)
             
-            for key, value in zadanie.items():
-                if key not in ["krótkie_zadanie", "refleksja_zadania"]:
-                    st.text_input(
-                        f"✨ {key.replace('_', ' ').title()}:",
-                        value,
-                        key=f"task_{key}",
-                        help="Wpisz swoje przemyślenia tutaj"
-                    )
+            display_daily_task_inputs(zadanie)
             
             # Refleksja zadania
             st.markdown(f"""
@@ -246,6 +286,18 @@ def display_daily_rune(runa: RunaPelna) -> None:
                 </p>
             """, unsafe_allow_html=True)
 
+@st.fragment
+def display_daily_task_inputs(zadanie: dict) -> None:
+    """Pola odpowiedzi zadania dnia - wpisanie tekstu odświeża tylko ten fragment strony."""
+    for key, value in zadanie.items():
+        if key not in ["krótkie_zadanie", "refleksja_zadania"]:
+            st.text_input(
+                f"✨ {key.replace('_', ' ').title()}:",
+                value,
+                key=f"task_{key}",
+                help="Wpisz swoje przemyślenia tutaj"
+            )
+
 #?##########################################################################################################
 #TODO#######################################################################################################
 #?                                                  Rozkłady Runiczne
@@ -275,32 +327,50 @@ def display_rune_layout(runy: list[RunaPelna]) -> None:
         unsafe_allow_html=True,
     )
     
-    # Create a single row of buttons
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        if st.button("1 Runa", use_container_width=True, type="primary"):
-            st.session_state["selected_layout"] = random.sample(runy, 1)
-    
-    with col2:
-        if st.button("3 Runy", use_container_width=True, type="primary"):
-            st.session_state["selected_layout"] = random.sample(runy, 3)
-    
-    with col3:
-        if st.button("5 Run", use_container_width=True, type="primary"):
-            st.session_state["selected_layout"] = random.sample(runy, 5)
-    
-    with col4:
-        if st.button("8 Run", use_container_width=True, type="primary"):
-            st.session_state["selected_layout"] = random.sample(runy, 8)
+    display_spread_area(runy)
+
+@st.fragment
+def display_spread_area(runy: list[RunaPelna]) -> None:
+    """Przyciski układów i wylosowany układ - kliknięcie odświeża tylko ten fragment strony."""
+    seed_text = st.text_input(**SEED_INPUT, key="spread_seed")
+
+    # Jeden przycisk na każdy układ z LAYOUT_SPREADS
+    for col, key in zip(st.columns(len(LAYOUT_SPREADS)), LAYOUT_SPREADS):
+        spread = SPREADS[key]
+        with col:
+            if st.button(spread.button, use_container_width=True, type="primary"):
+                if (seed := parse_seed(seed_text)) is not False:
+                    st.session_state["selected_layout"] = draw_spread(spread.key, len(spread.positions), runy, seed)
 
     # Display the selected layout in a new section
     if "selected_layout" in st.session_state:
         st.markdown('<div style="height: 30px;"></div>', unsafe_allow_html=True)
         display_uklad_run(st.session_state["selected_layout"])
 
-def display_uklad_run(uklad: list[RunaPelna]) -> None:
-    """Wyświetla wylosowany układ run."""
+# Pole ziarna układu - wspólne dla rozkładów i krzyża celtyckiego
+SEED_INPUT = {
+    "label": "Ziarno układu (opcjonalnie)",
+    "placeholder": "puste pole - nowe losowanie",
+    "help": "Wpisz ziarno pokazane pod wcześniejszym układem, aby odtworzyć dokładnie ten sam układ",
+}
+
+def parse_seed(text: str):
+    """Ziarno wpisane w pole: liczba, None dla pustego pola albo False, gdy wpis nie jest liczbą."""
+    text = text.strip()
+    if not text:
+        return None
+    if text.isdecimal():
+        return int(text)
+    st.error("Ziarno układu musi być nieujemną liczbą całkowitą.")
+    return False
+
+def display_seed(record: SpreadRecord) -> None:
+    """Pokazuje ziarno wylosowanego układu."""
+    if record.seed is not None:
+        st.caption(f"Ziarno układu: {record.seed} - wpisz je w polu „Ziarno układu”, aby odtworzyć ten układ")
+
+def display_uklad_run(record: SpreadRecord) -> None:
+    """Wyświetla wylosowany układ run zapisany w sesji."""
     st.header("", divider="rainbow")
     st.caption('"Gdy nadejdzie Ragnarok, to te runy będą miały znaczenie"')
     st.markdown(
@@ -312,190 +382,56 @@ def display_uklad_run(uklad: list[RunaPelna]) -> None:
         unsafe_allow_html=True,
     )
 
-    uklad_len = len(uklad)
+    spread = spread_for(record)
+    if spread is None:
+        st.warning("Nieznany układ run – nie mogę zinterpretować.")
+        return
 
-    # ✨ Mistyczne opisy dla każdego układu
-    if uklad_len == 1:
-        st.markdown("""
-        <div style="background-color: rgba(193, 71, 233, 0.1); padding: 20px; border-radius: 12px; box-shadow: 0 0 10px #C147E9;">
-            <p style="color: #FFD700; font-size: 18px; text-align: center;">
-            <strong>Układ 1 Runa</strong><br>
-            Jedna runa – jedno objawienie. To serce twojego pytania, rdzeń sytuacji, klucz do zrozumienia.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+    # ✨ Opis znaczenia i wszystkie runy układu - z pamięci podręcznej, liczone raz na losowanie
+    render_spread(record)
+    display_seed(record)
+    if spread.details:
+        display_spread_details(spread, resolve_spread(record)[0])
 
-    elif uklad_len == 3:
-        st.markdown("""
-        <div style="background-color: rgba(193, 71, 233, 0.1); padding: 20px; border-radius: 12px; box-shadow: 0 0 10px #C147E9;">
-            <p style="color: #FFD700; font-size: 18px; text-align: center;">
-            <strong>Układ 3 Runy – Triada Czasu</strong><br>
-            <em>Lewa</em> – przeszłość: duchowe korzenie pytania<br>
-            <em>Środek</em> – teraźniejszość: energie, które cię otaczają<br>
-            <em>Prawa</em> – przyszłość: możliwy kierunek lub ostrzeżenie
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+@st.fragment
+def display_spread_details(spread: Spread, uklad: list[RunaPelna]) -> None:
+    """Przyciski wybranych pozycji układu i panel opisu runy - wybór odświeża tylko ten fragment."""
+    # Initialize session state for selected rune if not exists
+    if 'selected_rune' not in st.session_state:
+        st.session_state.selected_rune = None
 
-    elif uklad_len == 5:
-        st.markdown("""
-        <div style="background-color: rgba(193, 71, 233, 0.1); padding: 20px; border-radius: 12px; box-shadow: 0 0 10px #C147E9;">
-            <p style="color: #FFD700; font-size: 18px; text-align: center;">
-            <strong>Układ 5 Run – Gwiazda Przemian</strong><br>
-            1 – przeszłość, 2 – teraźniejszość, 3 – przyszłość<br>
-            4 – twoja siła duchowa, 5 – dar lub ostrzeżenie z zewnątrz
+    st.markdown('<div style="height: 30px;"></div>', unsafe_allow_html=True)
+    for col, numer in zip(st.columns(len(spread.details)), spread.details):
+        with col:
+            if st.button(spread.positions[numer].label, key=f"rune{numer + 1}_button", use_container_width=True):
+                st.session_state.selected_rune = rune_id(uklad[numer])
+
+    if st.session_state.selected_rune is not None:
+        wybrana = rune_by_id(st.session_state.selected_rune)
+        st.markdown(f"""
+        <div style="background: linear-gradient(135deg, rgba(147, 51, 234, 0.2) 0%, rgba(193, 71, 233, 0.3) 100%); 
+                    padding: 25px; 
+                    border-radius: 15px; 
+                    margin: 20px 0; 
+                    border: 2px solid rgba(193, 71, 233, 0.5);
+                    box-shadow: 0 4px 20px rgba(193, 71, 233, 0.2);">
+            <h3 style="color: {COLORS['accent']}; text-align: center; margin-bottom: 15px;">
+            {wybrana.nazwa}
+            </h3>
+            <p style="color: {COLORS['text']}; font-size: 16px; line-height: 1.6;">
+            {wybrana.znaczenie}
             </p>
         </div>
         """, unsafe_allow_html=True)
-
-    elif uklad_len == 8:
+    else:
         st.markdown("""
-        <div style="background-color: rgba(193, 71, 233, 0.1); padding: 20px; border-radius: 12px; box-shadow: 0 0 10px #C147E9;">
-            <p style="color: #FFD700; font-size: 18px; text-align: center;">
-            <strong>Układ 8 Run – Krąg Życia</strong><br>
-            Osiem run tworzy pełen cykl: każda runa odsłania inny aspekt twojej ścieżki – od narodzin idei po jej transformację.
+        <div style="text-align: center; padding: 20px;">
+            <p style="color: #666; font-style: italic;">
+            Kliknij na runę, aby zobaczyć jej opis
             </p>
         </div>
         """, unsafe_allow_html=True)
 
-        # Create a grid layout for the 8-rune spread
-        st.markdown('<div style="height: 30px;"></div>', unsafe_allow_html=True)
-        
-        # Top row (empty-1-2-3-empty)
-        col_empty1, col1, col2, col3, col_empty2 = st.columns(5)
-        with col_empty1:
-            st.markdown('<div style="height: 100px;"></div>', unsafe_allow_html=True)
-        
-        with col1:
-            st.markdown('<div style="text-align: center;">', unsafe_allow_html=True)
-            odwrocona = uklad[0].pokaz_interaktywny_obraz(losowa_orientacja=True)
-            nazwa = uklad[0].get_nazwa_odwrocona() if odwrocona else uklad[0].nazwa
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 16px;'>1. Teraz</p>", unsafe_allow_html=True)
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 14px;'>{nazwa}</p>", unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown('<div style="text-align: center;">', unsafe_allow_html=True)
-            odwrocona = uklad[1].pokaz_interaktywny_obraz(losowa_orientacja=True)
-            nazwa = uklad[1].get_nazwa_odwrocona() if odwrocona else uklad[1].nazwa
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 16px;'>2. Przeszłość</p>", unsafe_allow_html=True)
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 14px;'>{nazwa}</p>", unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown('<div style="text-align: center;">', unsafe_allow_html=True)
-            odwrocona = uklad[2].pokaz_interaktywny_obraz(losowa_orientacja=True)
-            nazwa = uklad[2].get_nazwa_odwrocona() if odwrocona else uklad[2].nazwa
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 16px;'>3. Przyszłość</p>", unsafe_allow_html=True)
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 14px;'>{nazwa}</p>", unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col_empty2:
-            st.markdown('<div style="height: 100px;"></div>', unsafe_allow_html=True)
-
-        # Middle row (4-description-5)
-        col4, col_desc, col5 = st.columns([1, 3, 1])
-        
-        # Initialize session state for selected rune if not exists
-        if 'selected_rune' not in st.session_state:
-            st.session_state.selected_rune = None
-        
-        with col4:
-            st.markdown('<div style="text-align: center;">', unsafe_allow_html=True)
-            if st.button("4. Przeszkody", key="rune4_button", use_container_width=True):
-                st.session_state.selected_rune = uklad[3]
-            odwrocona = uklad[3].pokaz_interaktywny_obraz(losowa_orientacja=True)
-            nazwa = uklad[3].get_nazwa_odwrocona() if odwrocona else uklad[3].nazwa
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 14px;'>{nazwa}</p>", unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col_desc:
-            if st.session_state.selected_rune:
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, rgba(147, 51, 234, 0.2) 0%, rgba(193, 71, 233, 0.3) 100%); 
-                            padding: 25px; 
-                            border-radius: 15px; 
-                            margin: 20px 0; 
-                            border: 2px solid rgba(193, 71, 233, 0.5);
-                            box-shadow: 0 4px 20px rgba(193, 71, 233, 0.2);">
-                    <h3 style="color: {COLORS['accent']}; text-align: center; margin-bottom: 15px;">
-                    {st.session_state.selected_rune.nazwa}
-                    </h3>
-                    <p style="color: {COLORS['text']}; font-size: 16px; line-height: 1.6;">
-                    {st.session_state.selected_rune.znaczenie}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                <div style="text-align: center; padding: 20px;">
-                    <p style="color: #666; font-style: italic;">
-                    Kliknij na runę, aby zobaczyć jej opis
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        with col5:
-            st.markdown('<div style="text-align: center;">', unsafe_allow_html=True)
-            if st.button("5. Wzmocnienia", key="rune5_button", use_container_width=True):
-                st.session_state.selected_rune = uklad[4]
-            odwrocona = uklad[4].pokaz_interaktywny_obraz(losowa_orientacja=True)
-            nazwa = uklad[4].get_nazwa_odwrocona() if odwrocona else uklad[4].nazwa
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 14px;'>{nazwa}</p>", unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-
-        # Bottom row (empty-6-7-8-empty)
-        col_empty6, col6, col7, col8, col_empty7 = st.columns(5)
-        with col_empty6:
-            st.markdown('<div style="height: 100px;"></div>', unsafe_allow_html=True)
-        
-        with col6:
-            st.markdown('<div style="text-align: center;">', unsafe_allow_html=True)
-            odwrocona = uklad[5].pokaz_interaktywny_obraz(losowa_orientacja=True)
-            nazwa = uklad[5].get_nazwa_odwrocona() if odwrocona else uklad[5].nazwa
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 16px;'>6. Ludzie</p>", unsafe_allow_html=True)
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 14px;'>{nazwa}</p>", unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col7:
-            st.markdown('<div style="text-align: center;">', unsafe_allow_html=True)
-            odwrocona = uklad[6].pokaz_interaktywny_obraz(losowa_orientacja=True)
-            nazwa = uklad[6].get_nazwa_odwrocona() if odwrocona else uklad[6].nazwa
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 16px;'>7. Rada</p>", unsafe_allow_html=True)
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 14px;'>{nazwa}</p>", unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col8:
-            st.markdown('<div style="text-align: center;">', unsafe_allow_html=True)
-            odwrocona = uklad[7].pokaz_interaktywny_obraz(losowa_orientacja=True)
-            nazwa = uklad[7].get_nazwa_odwrocona() if odwrocona else uklad[7].nazwa
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 16px;'>8. Wynik</p>", unsafe_allow_html=True)
-            st.markdown(f"<p style='color: {COLORS['accent']}; font-size: 14px;'>{nazwa}</p>", unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col_empty7:
-            st.markdown('<div style="height: 100px;"></div>', unsafe_allow_html=True)
-
-    else:
-        st.warning("Nieznany układ run – nie mogę zinterpretować.")
-        return
-
-    # For layouts other than 8 runes, display in columns
-    if uklad_len != 8:
-        st.markdown('<div style="height: 30px;"></div>', unsafe_allow_html=True)
-        cols = st.columns(uklad_len)
-
-        for i, (col, runa) in enumerate(zip(cols, uklad)):
-            with col:
-                st.markdown('<div style="display: flex; justify-content: center; align-items: center; flex-direction: column;">', unsafe_allow_html=True)
-                odwrocona = runa.pokaz_interaktywny_obraz(losowa_orientacja=True)
-                nazwa = runa.get_nazwa_odwrocona() if odwrocona else runa.nazwa
-                st.markdown(
-                    f"<p style='text-align: center; color: {COLORS['accent']}; margin-top: 10px; font-size: 20px;'>{nazwa}</p>",
-                    unsafe_allow_html=True
-                )
-                st.markdown('</div>', unsafe_allow_html=True)
-
 
 #?##########################################################################################################
 #TODO#######################################################################################################
@@ -516,46 +452,31 @@ def display_celtic_cross(runy: list[RunaPelna]) -> None:
 
 
     
-    if len(runy) < 4:
-        st.error("Potrzebujesz co najmniej 4 runy do tego układu!")
+    celtic = SPREADS["celtic"]
+    if len(runy) < len(celtic.positions):
+        st.error(f"Potrzebujesz co najmniej {len(celtic.positions)} runy do tego układu!")
         return
 
+    seed_text = st.text_input(**SEED_INPUT, key="celtic_seed")
     if st.button("**Stwórz krzyż celtycki**", use_container_width=True,type="primary"):
-        uklad = random.sample(runy, 4)
-        display_celtic_cross_layout(uklad)
-        display_celtic_interpretation(uklad)
+        if (seed := parse_seed(seed_text)) is not False:
+            st.session_state["celtic_spread"] = draw_spread(celtic.key, len(celtic.positions), runy, seed)
+
+    # Wylosowany krzyż zostaje w sesji i jest rysowany przy każdym przebiegu z gotowych zasobów
+    if (record := st.session_state.get("celtic_spread")) is not None and spread_for(record) is not None:
+        display_celtic_cross_layout(record)
+        display_celtic_interpretation(*resolve_spread(record))
 
 
     st.subheader("", divider="rainbow")
     st.caption('„Wieszczka runiczna jeszcze nie jest gotowa..."')
-def display_celtic_cross_layout(uklad: list[RunaPelna]) -> None:
+def display_celtic_cross_layout(record: SpreadRecord) -> None:
     """Wizualizacja układu krzyża celtyckiego."""
     st.header("", divider="rainbow")
+    render_spread(record)
+    display_seed(record)
 
-    # Górna runa
-    col1, col2, col3 = st.columns([1, 1, 1])
-    with col2:
-        st.markdown("<div style='height: 50px;'></div>", unsafe_allow_html=True)
-        odwrocona1 = uklad[0].pokaz_interaktywny_obraz(losowa_orientacja=True)
-        st.markdown("<div style='height: 30px;'></div>", unsafe_allow_html=True)
-
-    # Środkowy wiersz
-    cols = st.columns(3)
-    with cols[0]:
-        odwrocona2 = uklad[1].pokaz_interaktywny_obraz(losowa_orientacja=True)
-    with cols[2]:
-        odwrocona3 = uklad[2].pokaz_interaktywny_obraz(losowa_orientacja=True)
-
-    # Dolna runa
-    col1, col2, col3 = st.columns([1, 1, 1])
-    with col2:
-        st.markdown("<div style='height: 30px;'></div>", unsafe_allow_html=True)
-        odwrocona4 = uklad[3].pokaz_interaktywny_obraz(losowa_orientacja=True)
-    
-    # Zapisz informacje o odwróceniu run w session_state
-    st.session_state["odwrocone_runy"] = [odwrocona1, odwrocona2, odwrocona3, odwrocona4]
-
-def display_celtic_interpretation(uklad: list[RunaPelna]) -> None:
+def display_celtic_interpretation(uklad: list[RunaPelna], odwrocone: list[bool]) -> None:
     """Wyświetla interpretację układu celtyckiego."""
     st.subheader("", divider="rainbow")
 
@@ -568,21 +489,14 @@ def display_celtic_interpretation(uklad: list[RunaPelna]) -> None:
         unsafe_allow_html=True,
     )
     
-    positions = [
-        "Obecna sytuacja",
-        "Wyzwania",
-        "Przeszłość wpływająca na obecną sytuację",
-        "Potencjalna przyszłość"
-    ]
-    
-    # Pobierz informacje o odwróceniu run
-    odwrocone_runy = st.session_state.get("odwrocone_runy", [False] * 4)
+    positions = [position.label for position in SPREADS["celtic"].positions]
     
     for i, (runa, position) in enumerate(zip(uklad, positions)):
-        with st.expander(f"{position}: {runa.nazwa} {'(odwrócona)' if odwrocone_runy[i] else ''}"):
-            if odwrocone_runy[i]:
+        with st.expander(f"{position}: {runa.nazwa} {'(odwrócona)' if odwrocone[i] else ''}"):
+            if odwrocone[i]:
                 st.info("Runa jest odwrócona - interpretuj jako cień znaczenia", icon="⚠️")
             display_rune_details(runa)
+            display_related_runes(runa)
 
 def display_rune_descriptions(uklad):
     """Wyświetla opisy wylosowanych run w układzie krzyża celtyckiego."""
@@ -600,12 +514,14 @@ def display_rune_descriptions(uklad):
 #?##########################################################################################################
 #TODO#######################################################################################################
 
-def find_rune_data(runa_nazwa, full_data):
-    """Znajdź dane runy w pełnych danych JSON."""
-    for runa_data in full_data:
-        if runa_data.get("nazwa") == runa_nazwa or runa_nazwa in runa_data.get("nazwa", ""):
-            return runa_data
-    return None
+def find_rune_data(runa_nazwa, full_data=None):
+    """Znajdź dane runy w pełnych danych JSON (po nazwie, aliasie lub nazwie z literówką)."""
+    record = get_repository().find(runa_nazwa)
+    if record is None:
+        return None
+    if full_data is None:
+        return record.full
+    return next((runa_data for runa_data in full_data if runa_data.get("nazwa") == record.nazwa), None)
 
 def load_and_resize_rune_image(runa_obraz_path, size=(200, 200), rotate=False):
     """Ładuje obraz runy, zmienia jego rozmiar i opcjonalnie obraca."""
@@ -2,12 +2,27 @@ import os
 import base64
 import streamlit as st
 from PIL import Image
-import json
+import time
 import random
-from constants import DATA_FRONT_PATH, MAX_HEIGHT, MAX_WIDTH, MIN_WIDTH, MIN_HEIGHT
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from constants import (MAX_HEIGHT, MAX_WIDTH, MIN_WIDTH, MIN_HEIGHT,
+                       IMAGE_CACHE_MAX_BYTES, INTERACTIVE_WIDTH, IMAGE_RENDER_MODE, FAST_DECODE,
+                       IMAGE_BATCH_EXECUTOR, IMAGE_BATCH_WORKERS, REVERSE_CHANCE)
+from cache import LRUCache
+from assets import ASSET_MANIFEST, RUNE_ATLAS, STATIC_IMAGES
+from repository import freeze
 import io
 
 
+# Wspólna dla wszystkich sesji pamięć gotowych (zakodowanych) obrazów run
+IMAGE_CACHE = LRUCache(IMAGE_CACHE_MAX_BYTES)
+
+# Pule do równoległego przygotowania obrazów (tworzone leniwie, po jednej na rodzaj i rozmiar)
+_EXECUTORS = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
 class RunaPelna:
     """Baza danych run, glowna klasa do przechowywania informacji o runach.
     Klasa ta zawiera wszystkie atrybuty runy, takie jak nazwa, opis, znaczenie itp."""
@@ -31,19 +46,42 @@ class ImageProcessor:
     """Klasa odpowiedzialna za przetwarzanie obrazów run."""
     
     @staticmethod
-    def open_image(image_path):
-        """Otwiera i zwraca obraz jeśli istnieje, w przeciwnym razie zwraca None"""
+    def open_image(image_path, draft_size=None):
+        """
+        Otwiera i zwraca obraz jeśli istnieje, w przeciwnym razie zwraca None.
+
+        Dla plików JPEG podanie `draft_size` dekoduje obraz od razu w skali
+        1/2, 1/4 lub 1/8 (skalowanie w dziedzinie DCT), ale nie mniejszej niż
+        `draft_size`; ostateczne skalowanie robi resize_image.
+        """
         try:
             if not os.path.exists(image_path):
                 st.error(f"Plik obrazu nie istnieje: {image_path}")
                 return None
-                
-            return Image.open(image_path).convert("RGB")
+
+            return ImageProcessor.read_image(image_path, draft_size)
         except Exception as e:
             st.error(f"Nie można otworzyć obrazu: {image_path}")
             st.text(f"Błąd: {e}")
             return None
-    
+
+    @staticmethod
+    def read_image(image_path, draft_size=None):
+        """Jak open_image, ale bez komunikatów Streamlit - błędy zgłasza wyjątkiem (bezpieczne w wątkach puli)."""
+        img = Image.open(image_path)
+        if draft_size and img.format == "JPEG":
+            img.draft("RGB", draft_size)
+        return img.convert("RGB")
+
+    @staticmethod
+    def fit_image(img, target_width, target_height):
+        """Skaluje obraz do prostokąta z zachowaniem proporcji (bez obsługi błędów)."""
+        original_width, original_height = img.size
+        scale = min(target_width / original_width, target_height / original_height)
+        new_width = int(original_width * scale)
+        new_height = int(original_height * scale)
+        return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
     @staticmethod
     def resize_image(img, target_width, target_height):
         """Zmienia rozmiar obrazu zachowując proporcje"""
@@ -51,19 +89,28 @@ class ImageProcessor:
             return None
             
         try:
-            original_width, original_height = img.size
-            scale = min(target_width / original_width, target_height / original_height)
-            new_width = int(original_width * scale)
-            new_height = int(original_height * scale)
-            
-            return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            return ImageProcessor.fit_image(img, target_width, target_height)
         except Exception as e:
             st.error(f"Nie można zmienić rozmiaru obrazu")
             st.text(f"Błąd: {e}")
             return None
     
     @staticmethod
-    def process_orientation(img, is_reversed=False, random_orientation=False):
+    def report_errors(timings):
+        """Pokazuje błędy zapisane przez zadania puli (wywoływać w wątku skryptu, nie w puli)."""
+        for error in dict.fromkeys(t["error"] for t in timings if t.get("error")):
+            st.error(error)
+
+    @staticmethod
+    def choose_orientation(is_reversed=False, random_orientation=False, rng=None):
+        """Rozstrzyga, czy runa ma być odwrócona (losowo - generatorem `rng`, domyślnie globalnym)."""
+        if random_orientation:
+            # 33% szans na odwrócenie runy
+            return (rng or random).random() < REVERSE_CHANCE
+        return is_reversed
+
+    @staticmethod
+    def process_orientation(img, is_reversed=False, random_orientation=False, rng=None):
         """
         Przetwarza orientację obrazu runy.
         
@@ -71,6 +118,7 @@ class ImageProcessor:
             img: Obiekt obrazu PIL
             is_reversed: Czy wymusić odwrócenie
             random_orientation: Czy losowo wybierać orientację
+            rng: Generator random.Random do losowania (powtarzalnego przy tym samym ziarnie)
             
         Returns:
             tuple: (przetworzony_obraz, czy_odwrocony)
@@ -78,11 +126,7 @@ class ImageProcessor:
         if img is None:
             return None, False
             
-        is_reversed_result = is_reversed
-        
-        if random_orientation:
-            # 33% szans na odwrócenie runy
-            is_reversed_result = random.random() < 0.33
+        is_reversed_result = ImageProcessor.choose_orientation(is_reversed, random_orientation, rng)
         
         if is_reversed_result:
             # Odwracamy obraz o 180 stopni
@@ -96,13 +140,202 @@ class ImageProcessor:
         if img is None:
             return ""
             
+        return base64.b64encode(ImageProcessor.to_jpeg_bytes(img)).decode()
+
+    @staticmethod
+    def to_jpeg_bytes(img):
+        """Zapisuje obraz do bajtów JPEG."""
         buffer = io.BytesIO()
         img.save(buffer, format="JPEG")
-        return base64.b64encode(buffer.getvalue()).decode()
+        return buffer.getvalue()
+
+    @staticmethod
+    def get_image_src(image_path, size=None, is_reversed=False, mode=None):
+        """
+        Zwraca gotową wartość atrybutu `src` obrazu runy, korzystając z IMAGE_CACHE.
+
+        Klucz pamięci to (ścieżka, mtime pliku, rozmiar, orientacja, tryb), więc
+        podmiana pliku na dysku automatycznie unieważnia stare wpisy.
+
+        Args:
+            image_path: Ścieżka do pliku obrazu
+            size: Krotka (szerokość, wysokość) lub None dla oryginalnego rozmiaru
+            is_reversed: Czy obraz ma być obrócony o 180 stopni
+            mode: "inline" (data URI base64) lub "static" (URL pliku);
+                  domyślnie HTMLRenderer.render_mode
+
+        Returns:
+            str: Wartość `src` lub pusty napis w razie błędu
+        """
+        mode = mode or HTMLRenderer.render_mode
+        try:
+            mtime = os.path.getmtime(image_path)
+        except OSError:
+            st.error(f"Plik obrazu nie istnieje: {image_path}")
+            return ""
+
+        def build():
+            data, timings = ImageProcessor.load_jpeg_timed(image_path, size, is_reversed)
+            ImageProcessor.report_errors([timings])
+            return ImageProcessor.to_src(data, mode)
+
+        key = (image_path, mtime, size, is_reversed, mode)
+        return IMAGE_CACHE.get_or_create(key, build)
+
+    @staticmethod
+    def to_src(data, mode="inline"):
+        """Zamienia bajty JPEG na data URI albo adres pliku statycznego."""
+        if not data:
+            return ""
+        if mode == "static":
+            return STATIC_IMAGES.publish(data)
+        return f"data:image/jpeg;base64,{base64.b64encode(data).decode()}"
+
+    @staticmethod
+    def load_jpeg(image_path, size=None, is_reversed=False):
+        """Zwraca bajty JPEG z gotowego wariantu w data/cache, a gdy go brak - przetwarza obraz na żywo."""
+        return ImageProcessor.load_jpeg_timed(image_path, size, is_reversed)[0]
+
+    @staticmethod
+    def load_jpeg_timed(image_path, size=None, is_reversed=False, use_variants=True):
+        """Jak load_jpeg, ale zwraca też czasy etapów w sekundach: (bajty, {etap: czas})."""
+        if size and use_variants:
+            start = time.perf_counter()
+            variant_path = ASSET_MANIFEST.lookup(image_path, size, is_reversed)
+            if variant_path:
+                with open(variant_path, "rb") as f:
+                    return f.read(), {"read": time.perf_counter() - start}
+        return ImageProcessor.render_jpeg_timed(image_path, size, is_reversed)
+
+    @staticmethod
+    def render_jpeg(image_path, size=None, is_reversed=False, fast_decode=FAST_DECODE):
+        """Dekoduje, skaluje i obraca obraz, zwracając bajty JPEG (bez pamięci podręcznej)."""
+        return ImageProcessor.render_jpeg_timed(image_path, size, is_reversed, fast_decode)[0]
+
+    @staticmethod
+    def render_jpeg_timed(image_path, size=None, is_reversed=False, fast_decode=FAST_DECODE):
+        """
+        Jak render_jpeg, ale zwraca też czasy etapów decode / resize / encode.
+
+        Działa też w wątkach i procesach puli, gdzie nie ma kontekstu Streamlit,
+        więc błąd nie jest wyświetlany, tylko zapisany w czasach pod kluczem "error".
+        """
+        timings = {}
+        try:
+            start = time.perf_counter()
+            img = ImageProcessor.read_image(image_path, size if fast_decode else None)
+            timings["decode"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if size:
+                img = ImageProcessor.fit_image(img, size[0], size[1])
+            timings["resize"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if is_reversed:
+                img = img.rotate(180)
+            data = ImageProcessor.to_jpeg_bytes(img)
+            timings["encode"] = time.perf_counter() - start
+        except Exception as e:
+            timings["error"] = f"Nie można otworzyć obrazu: {image_path} ({e})"
+            return b"", timings
+        return data, timings
+
+    @staticmethod
+    def prepare_batch(jobs, executor=IMAGE_BATCH_EXECUTOR, max_workers=IMAGE_BATCH_WORKERS,
+                      mode=None, use_variants=True):
+        """
+        Przygotowuje obrazy wielu run naraz i zapisuje je w IMAGE_CACHE.
+
+        Dekodowanie, skalowanie i kodowanie JPEG biegną równolegle w ograniczonej
+        puli wątków lub procesów; gotowe `src` trafiają do pamięci podręcznej,
+        więc kolejne wywołania get_image_src są natychmiastowe.
+
+        Args:
+            jobs: Lista krotek (runa lub ścieżka obrazu, (szerokość, wysokość), czy_odwrocona)
+            executor: "thread" lub "process"
+            max_workers: Rozmiar puli
+            mode: Tryb obrazów jak w get_image_src
+            use_variants: Czy korzystać z gotowych wariantów z data/cache
+
+        Returns:
+            tuple: (lista `src` w kolejności zadań, lista słowników z czasami etapów;
+                    nieudane zadania mają w nich klucz "error" - zob. report_errors)
+        """
+        mode = mode or HTMLRenderer.render_mode
+        results = [""] * len(jobs)
+        timings = [{"cached": True} for _ in jobs]
+
+        # Zadania już obecne w pamięci nie trafiają do puli; duplikaty liczymy raz
+        pending = {}
+        for i, (rune, size, is_reversed) in enumerate(jobs):
+            image_path = getattr(rune, "obraz", rune)
+            try:
+                mtime = os.path.getmtime(image_path)
+            except OSError:
+                timings[i] = {"cached": False, "error": f"Plik obrazu nie istnieje: {image_path}"}
+                continue
+            key = (image_path, mtime, size, is_reversed, mode)
+            cached = IMAGE_CACHE.get(key)
+            if cached:
+                results[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            pool = ImageProcessor._get_executor(executor, max_workers)
+            futures = {
+                key: pool.submit(ImageProcessor.load_jpeg_timed, key[0], key[2], key[3], use_variants)
+                for key in pending
+            }
+            for key, future in futures.items():
+                data, job_timings = future.result()
+                start = time.perf_counter()
+                image_src = ImageProcessor.to_src(data, mode)
+                job_timings["src"] = time.perf_counter() - start
+                if image_src:
+                    IMAGE_CACHE.put(key, image_src)
+                for i in pending[key]:
+                    results[i] = image_src
+                    timings[i] = dict(job_timings, cached=False)
+
+        return results, timings
+
+    @staticmethod
+    def _get_executor(kind, max_workers):
+        """Zwraca współdzieloną pulę wątków lub procesów o danym rozmiarze."""
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Nieznany rodzaj puli: {kind}")
+        with _EXECUTORS_LOCK:
+            pool = _EXECUTORS.get((kind, max_workers))
+            if pool is None:
+                pool_class = ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+                pool = pool_class(max_workers=max_workers)
+                _EXECUTORS[(kind, max_workers)] = pool
+            return pool
 
 
 class HTMLRenderer:
     """Klasa odpowiedzialna za rendering HTML dla wyświetlania run."""
+
+    # Tryb osadzania obrazów ("inline" lub "static") i licznik wysłanego HTML obrazów
+    render_mode = IMAGE_RENDER_MODE
+    payload_stats = {"images": 0, "bytes": 0}
+
+    @staticmethod
+    def set_render_mode(mode):
+        """Przełącza tryb osadzania obrazów i zeruje liczniki rozmiaru."""
+        if mode not in ("inline", "static"):
+            raise ValueError(f"Nieznany tryb obrazów: {mode}")
+        HTMLRenderer.render_mode = mode
+        HTMLRenderer.payload_stats = {"images": 0, "bytes": 0}
+
+    @staticmethod
+    def _send(html, images=1):
+        """Wysyła HTML obrazów i dolicza jego rozmiar do statystyk."""
+        HTMLRenderer.payload_stats["images"] += images
+        HTMLRenderer.payload_stats["bytes"] += len(html.encode("utf-8"))
+        st.markdown(html, unsafe_allow_html=True)
     
     @staticmethod
     def get_border_style(is_reversed):
@@ -112,66 +345,127 @@ class HTMLRenderer:
         return ''
     
     @staticmethod
-    def display_image(encoded_img, display_name, max_width, border_style=""):
+    def display_image(image_src, display_name, max_width, border_style=""):
         """Generuje i wyświetla kod HTML dla obrazu runy"""
-        if not encoded_img:
+        if not image_src:
             st.error(f"Nie można wyświetlić obrazu")
             return
             
-        st.markdown(
+        HTMLRenderer._send(
             f"""
             <div>
-                <img src="data:image/jpeg;base64,{encoded_img}" alt="{display_name}" 
+                <img src="{image_src}" alt="{display_name}" loading="lazy"
                     style="width:100%; max-width: {max_width}px; {border_style}"/>
             </div>
-            """,
-            unsafe_allow_html=True,
+            """
         )
     
     @staticmethod
-    def display_interactive_image(encoded_img, display_name, max_width, border_style=""):
+    def interactive_image_html(image_src, display_name, max_width, border_style=""):
+        """Zwraca HTML interaktywnego obrazu runy"""
+        return f"""
+            <div class="runa-container">
+                <img class="runa-img" src="{image_src}" alt="{display_name}" loading="lazy"
+                    style="width:100%; max-width: {max_width}px; {border_style}"/>
+            </div>
+            """
+
+    @staticmethod
+    def display_interactive_image(image_src, display_name, max_width, border_style=""):
         """Wyświetla interaktywny obraz runy"""
-        if not encoded_img:
+        if not image_src:
             st.error(f"Nie można wyświetlić obrazu")
             return
             
-        st.markdown(
-            f"""
+        HTMLRenderer._send(HTMLRenderer.interactive_image_html(image_src, display_name, max_width, border_style))
+
+    @staticmethod
+    def atlas_image_html(atlas_url, atlas_size, tile, display_name, max_width, border_style=""):
+        """
+        Zwraca HTML interaktywnego obrazu runy jako wycinka atlasu (tło CSS).
+
+        Rozmiar i położenie tła są podane w procentach, więc wycinek skaluje się
+        razem z kolumną, a przeglądarka pobiera atlas tylko raz dla całej strony.
+        """
+        atlas_width, atlas_height = atlas_size
+        size_x = atlas_width / tile["w"] * 100
+        size_y = atlas_height / tile["h"] * 100
+        pos_x = tile["x"] / (atlas_width - tile["w"]) * 100 if atlas_width > tile["w"] else 0
+        pos_y = tile["y"] / (atlas_height - tile["h"]) * 100 if atlas_height > tile["h"] else 0
+
+        return f"""
             <div class="runa-container">
-                <img class="runa-img" src="data:image/jpeg;base64,{encoded_img}" alt="{display_name}" 
-                    style="width:100%; max-width: {max_width}px; {border_style}"/>
+                <div class="runa-img" role="img" aria-label="{display_name}"
+                    style="width:{tile['w']}px; max-width: min(100%, {max_width}px); aspect-ratio: {tile['w']} / {tile['h']};
+                    background: url('{atlas_url}') no-repeat {pos_x:.4f}% {pos_y:.4f}% / {size_x:.4f}% {size_y:.4f}%; {border_style}"></div>
             </div>
-            """,
-            unsafe_allow_html=True,
-        )
+            """
+
+    @staticmethod
+    def display_atlas_image(atlas_url, atlas_size, tile, display_name, max_width, border_style=""):
+        """Wyświetla interaktywny obraz runy jako wycinek atlasu."""
+        HTMLRenderer._send(HTMLRenderer.atlas_image_html(atlas_url, atlas_size, tile, display_name,
+                                                         max_width, border_style))
 
 
 class Runa:
-    """Frontendowa klasa do pokazywania informacji o runach."""
-    
+    """
+    Frontendowa klasa do pokazywania informacji o runach.
+
+    Obiekty są tworzone raz na proces (supp.get_runes) i współdzielone przez
+    wszystkie sesje, dlatego są niezmienne i oparte na __slots__.
+    """
+
+    __slots__ = ("nazwa", "obraz", "znaczenie", "symbolika", "potencjal", "prakt_zastosowanie",
+                 "dodatkowe_info", "symbol", "aett", "pozycja", "kwargs")
+
+    # Pomocnicy bez stanu - jedna instancja dla wszystkich run
+    image_processor = ImageProcessor()
+    renderer = HTMLRenderer()
+
     def __init__(self, nazwa, obraz, **kwargs):
-        self.nazwa = nazwa
-        self.obraz = obraz
-        
-        # Extract specific attributes from kwargs if they exist
-        self.znaczenie = kwargs.get("znaczenie", "")
-        self.symbolika = kwargs.get("symbolika", {})
-        self.potencjal = kwargs.get("potencjal", [])
-        self.prakt_zastosowanie = kwargs.get("prakt_zastosowanie", [])
-        self.dodatkowe_info = kwargs.get("dodatkowe_info", "")
-        self.symbol = kwargs.get("symbol", "")
-        self.aett = kwargs.get("aett", "")
-        self.pozycja = kwargs.get("pozycja", "")
-        
-        # Store remaining kwargs
-        self.kwargs = {k: v for k, v in kwargs.items() 
-                    if k not in ["znaczenie", "symbolika", "potencjal", 
-                                "prakt_zastosowanie", "dodatkowe_info",
-                                "symbol", "aett", "pozycja"]}
-                                
-        # Helper objects
-        self.image_processor = ImageProcessor()
-        self.renderer = HTMLRenderer()
+        values = {
+            "nazwa": nazwa,
+            "obraz": obraz,
+            "znaczenie": kwargs.pop("znaczenie", ""),
+            "symbolika": kwargs.pop("symbolika", {}),
+            "potencjal": kwargs.pop("potencjal", []),
+            "prakt_zastosowanie": kwargs.pop("prakt_zastosowanie", []),
+            "dodatkowe_info": kwargs.pop("dodatkowe_info", ""),
+            "symbol": kwargs.pop("symbol", ""),
+            "aett": kwargs.pop("aett", ""),
+            "pozycja": kwargs.pop("pozycja", ""),
+            # Store remaining kwargs
+            "kwargs": kwargs,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, freeze(value))
+
+    @classmethod
+    def from_record(cls, record):
+        """Tworzy runę z rekordu wspólnego repozytorium danych."""
+        opis = record.front
+        return cls(
+            record.nazwa,
+            record.obraz,
+            znaczenie=opis.get("znaczenie", ""),
+            symbolika=opis.get("symbolika", {}),
+            potencjal=opis.get("potencjal", []),
+            prakt_zastosowanie=opis.get("praktyczne_zastosowanie", []),
+            dodatkowe_info=opis.get("dodatkowe_info", ""),
+            symbol=opis.get("symbol", ""),
+            aett=opis.get("aett", ""),
+            pozycja=opis.get("pozycja", ""),
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Runa {self.nazwa} jest niezmienna")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Runa {self.nazwa} jest niezmienna")
+
+    def __repr__(self):
+        return f"Runa({self.nazwa!r})"
 
     def get_nazwa_odwrocona(self):
         """Zwraca nazwę runy z oznaczeniem, że jest odwrócona."""
@@ -189,29 +483,27 @@ class Runa:
 
     def pokaz_obraz(self, max_width=MAX_WIDTH, max_height=MAX_HEIGHT, odwroc=False, losowa_orientacja=False):
         """Wyświetla obraz runy z określonymi parametrami"""
-        img = self.zmniejsz_obraz(max_width, max_height)
-        if img:
-            img, jest_odwrocony = ImageProcessor.process_orientation(img, odwroc, losowa_orientacja)
-            encoded_img = ImageProcessor.encode_image(img)
+        jest_odwrocony = ImageProcessor.choose_orientation(odwroc, losowa_orientacja)
+        image_src = ImageProcessor.get_image_src(self.obraz, (max_width, max_height), jest_odwrocony)
+        if image_src:
             nazwa_wyswietlana = self.get_nazwa_odwrocona() if jest_odwrocony else self.nazwa
             border_style = HTMLRenderer.get_border_style(jest_odwrocony)
             
-            HTMLRenderer.display_image(encoded_img, nazwa_wyswietlana, max_width, border_style)
+            HTMLRenderer.display_image(image_src, nazwa_wyswietlana, max_width, border_style)
             return jest_odwrocony
         return False
 
     def pokaz_obraz_dnia(self, odwroc=False, losowa_orientacja=False, size=(500, 500)):
         """Wyświetla obraz runy na dzień."""
-        img = self.zwieksz_obraz(size[0], size[1])
-        if img:
-            img, jest_odwrocony = ImageProcessor.process_orientation(img, odwroc, losowa_orientacja)
+        jest_odwrocony = ImageProcessor.choose_orientation(odwroc, losowa_orientacja)
+        image_src = ImageProcessor.get_image_src(self.obraz, tuple(size), jest_odwrocony)
+        if image_src:
             nazwa_wyswietlana = self.get_nazwa_odwrocona() if jest_odwrocony else self.nazwa
-            encoded_img = ImageProcessor.encode_image(img)
-            HTMLRenderer.display_image(encoded_img, nazwa_wyswietlana, size[0])
+            HTMLRenderer.display_image(image_src, nazwa_wyswietlana, size[0])
             return jest_odwrocony
         return False
 
-    def pokaz_interaktywny_obraz(self, odwroc=False, losowa_orientacja=False, max_width=300):
+    def pokaz_interaktywny_obraz(self, odwroc=False, losowa_orientacja=False, max_width=INTERACTIVE_WIDTH):
         """
         Wyświetla obraz runy z interaktywnymi efektami
         
@@ -223,36 +515,31 @@ class Runa:
         Returns:
             bool: Czy runa jest odwrócona
         """
-        img = ImageProcessor.open_image(self.obraz)
-        if img:
-            img, jest_odwrocony = ImageProcessor.process_orientation(img, odwroc, losowa_orientacja)
-            encoded_img = ImageProcessor.encode_image(img)
-            nazwa_wyswietlana = self.get_nazwa_odwrocona() if jest_odwrocony else self.nazwa
-            
-            # Dodaj specjalne obramowanie dla odwróconych run
-            border_style = 'border-radius: 20px; border: 5px solid hsl(349, 100%, 45%);' if jest_odwrocony else ''
-            
-            # Wyświetl interaktywny obraz
-            HTMLRenderer.display_interactive_image(encoded_img, nazwa_wyswietlana, max_width, border_style)
+        jest_odwrocony = ImageProcessor.choose_orientation(odwroc, losowa_orientacja)
+        if html := self.interaktywny_obraz_html(jest_odwrocony, max_width):
+            HTMLRenderer._send(html)
             return jest_odwrocony
         return False
 
-    def załaduj_opis(self):
-        """Ładowanie opisu runy z pliku JSON."""
-        try:
-            with open(DATA_FRONT_PATH, 'r', encoding='utf-8') as f:
-                opisy = json.load(f)
-                if self.nazwa in opisy:
-                    opis = opisy[self.nazwa]
-                    self.znaczenie = opis.get('znaczenie', '')
-                    self.symbolika = opis.get('symbolika', {})
-                    self.potencjal = opis.get('potencjal', [])
-                    self.prakt_zastosowanie = opis.get('praktyczne_zastosowanie', [])
-                    self.dodatkowe_info = opis.get('dodatkowe_info', '')
-                    self.symbol = opis.get('symbol', '')
-                    self.aett = opis.get('aett', '')
-                    self.pozycja = opis.get('pozycja', '')
-                else:
-                    st.warning(f"Brak opisu dla runy: {self.nazwa}")
-        except Exception as e:
-            st.error(f"Nie można załadować opisu runy: {str(e)}")
\ No newline at end of file
+    def uses_atlas(self, jest_odwrocony=False, max_width=INTERACTIVE_WIDTH):
+        """Czy interaktywny obraz runy będzie wycinkiem atlasu (wtedy osobny obraz nie jest potrzebny)."""
+        return (HTMLRenderer.render_mode == "static"
+                and RUNE_ATLAS.tile(self.nazwa, max_width, jest_odwrocony) is not None)
+
+    def interaktywny_obraz_html(self, jest_odwrocony=False, max_width=INTERACTIVE_WIDTH):
+        """Zwraca HTML interaktywnego obrazu runy (pusty napis, gdy obrazu brak)."""
+        nazwa_wyswietlana = self.get_nazwa_odwrocona() if jest_odwrocony else self.nazwa
+
+        # Dodaj specjalne obramowanie dla odwróconych run
+        border_style = 'border-radius: 20px; border: 5px solid hsl(349, 100%, 45%);' if jest_odwrocony else ''
+
+        # W trybie statycznym korzystamy z atlasu run (jeden plik na całą stronę)
+        if HTMLRenderer.render_mode == "static":
+            atlas_tile = RUNE_ATLAS.tile(self.nazwa, max_width, jest_odwrocony)
+            if atlas_tile:
+                return HTMLRenderer.atlas_image_html(*atlas_tile, nazwa_wyswietlana, max_width, border_style)
+
+        image_src = ImageProcessor.get_image_src(self.obraz, (max_width, max_width), jest_odwrocony)
+        if image_src:
+            return HTMLRenderer.interactive_image_html(image_src, nazwa_wyswietlana, max_width, border_style)
+        return ""
@@ -0,0 +1,261 @@
+###########################################################################
+#! "repository" - jedno źródło danych run dla całego procesu
+###########################################################################
+
+import os
+import sys
+import json
+import time
+import marshal
+import hashlib
+import threading
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional
+
+from constants import (DATA_FRONT_PATH, DATA_MAIN_PATH, DATA_DAILY_PATH, RUNE_PATH, FUTHARK_ORDER,
+                       DAILY_RELOAD_INTERVAL, CORPUS_SNAPSHOT_PATH)
+from cache import WatchedFile
+from rune_index import RuneIndex
+
+
+# Pola wymagane w plikach danych
+FRONT_REQUIRED_FIELDS = ["znaczenie", "symbolika", "potencjal", "praktyczne_zastosowanie"]
+FULL_REQUIRED_FIELDS = ["nazwa", "krotki_opis", "opis", "znaczenie",
+                        "interpretacja", "keywords", "url_zdjecia", "url", "aett", "pozycja"]
+
+# Wersja formatu snapshotu - zmienić przy każdej zmianie struktury lub walidacji
+SNAPSHOT_VERSION = 1
+
+
+def validate_rune_data(data, is_frontend=False):
+    """Sprawdza poprawność struktury danych run"""
+    if is_frontend:
+        # Sprawdzenie struktury front_data_rune.json (baza frontendowa)
+        if not isinstance(data, Mapping):
+            return False, "Oczekiwano słownika z nazwami run jako kluczami"
+
+        for rune_name, rune_data in data.items():
+            for field in FRONT_REQUIRED_FIELDS:
+                if field not in rune_data:
+                    return False, f"Brak wymaganego pola '{field}' dla runy '{rune_name}'"
+    else:
+        # Sprawdzenie struktury big_data_rune.json (baza główna)
+        if not isinstance(data, (list, tuple)):
+            return False, "Oczekiwano listy obiektów run"
+
+        for rune in data:
+            for field in FULL_REQUIRED_FIELDS:
+                if field not in rune:
+                    return False, f"Brak wymaganego pola '{field}' dla runy '{rune.get('nazwa', 'bez nazwy')}'"
+
+    return True, "Dane są poprawne"
+
+
+def read_json(path):
+    """Wczytuje plik JSON i zwraca (dane, liczba bajtów)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return json.loads(raw), len(raw)
+
+
+def parse_sources(front_path=DATA_FRONT_PATH, full_path=DATA_MAIN_PATH, daily_path=DATA_DAILY_PATH):
+    """
+    Wczytuje i sprawdza trzy pliki danych run.
+
+    Zwraca (front, full, daily, liczba bajtów). Z big_data zostają tylko pełne
+    rekordy run - plik zawiera też wiersze pomocnicze (sekwencje, aetty).
+    """
+    front, front_bytes = read_json(front_path)
+    is_valid, message = validate_rune_data(front, is_frontend=True)
+    if not is_valid:
+        raise ValueError(f"Błąd w pliku {os.path.basename(front_path)}: {message}")
+
+    full_rows, full_bytes = read_json(full_path)
+    if not isinstance(full_rows, list):
+        raise ValueError(f"Błąd w pliku {os.path.basename(full_path)}: Oczekiwano listy obiektów run")
+    full = [row for row in full_rows if all(field in row for field in FULL_REQUIRED_FIELDS)]
+
+    daily, daily_bytes = read_json(daily_path)
+    if not isinstance(daily, dict):
+        raise ValueError(f"Błąd w pliku {os.path.basename(daily_path)}: Oczekiwano słownika z nazwami run jako kluczami")
+
+    return front, full, daily, front_bytes + full_bytes + daily_bytes
+
+
+def source_hashes(*paths):
+    """Zwraca skróty SHA-256 plików źródłowych (klucz snapshotu)."""
+    hashes = []
+    for path in paths:
+        with open(path, "rb") as f:
+            hashes.append(hashlib.sha256(f.read()).hexdigest())
+    return hashes
+
+
+def _snapshot_header(hashes):
+    """Nagłówek snapshotu: wersja formatu, wersja Pythona (format marshal) i skróty źródeł."""
+    return [SNAPSHOT_VERSION, list(sys.version_info[:2]), hashes]
+
+
+def build_snapshot(front_path=DATA_FRONT_PATH, full_path=DATA_MAIN_PATH, daily_path=DATA_DAILY_PATH):
+    """Sprawdza dane run i zwraca snapshot (bajty marshal) gotowy do zapisu."""
+    front, full, daily, _ = parse_sources(front_path, full_path, daily_path)
+    hashes = source_hashes(front_path, full_path, daily_path)
+    return marshal.dumps({"header": _snapshot_header(hashes), "front": front, "full": full, "daily": daily})
+
+
+def load_snapshot(snapshot_path=CORPUS_SNAPSHOT_PATH, front_path=DATA_FRONT_PATH,
+                  full_path=DATA_MAIN_PATH, daily_path=DATA_DAILY_PATH, hashes=None):
+    """
+    Wczytuje snapshot danych run, jeśli pasuje do bieżących plików źródłowych.
+
+    Zwraca (front, full, daily, liczba bajtów) lub None, gdy snapshotu brak,
+    jest w innym formacie albo którykolwiek plik źródłowy się zmienił.
+    """
+    try:
+        with open(snapshot_path, "rb") as f:
+            raw = f.read()
+        snapshot = marshal.loads(raw)
+        header = snapshot["header"]
+    except (OSError, ValueError, EOFError, TypeError, KeyError):
+        return None
+    if hashes is None:
+        hashes = source_hashes(front_path, full_path, daily_path)
+    if header != _snapshot_header(hashes):
+        return None
+    return snapshot["front"], snapshot["full"], snapshot["daily"], len(raw)
+
+
+def freeze(value):
+    """Zamienia słowniki i listy (rekurencyjnie) na ich niezmienne odpowiedniki."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class RuneRecord(NamedTuple):
+    """Niezmienny rekord runy współdzielony przez wszystkie sesje."""
+    nazwa: str
+    pozycja: int
+    obraz: str
+    front: Mapping
+    full: Optional[Mapping]
+
+
+class RuneRepository:
+    """
+    Dane run (front, big i daily) wczytane i sprawdzone raz na proces.
+
+    Jeśli w data/cache jest snapshot zbudowany dla bieżących plików danych
+    (build_assets.py snapshot), dane są brane z niego bez parsowania JSON
+    i ponownej walidacji. Udostępnia indeksy po nazwie i po pozycji w Futharku
+    oraz niezmienne rekordy, z których korzystają wszystkie loadery aplikacji.
+    Dane runy dnia są przeładowywane po zmianie pliku (najwyżej co DAILY_RELOAD_INTERVAL s).
+    """
+
+    def __init__(self, front_path=DATA_FRONT_PATH, full_path=DATA_MAIN_PATH, daily_path=DATA_DAILY_PATH,
+                 daily_check_interval=DAILY_RELOAD_INTERVAL, snapshot_path=CORPUS_SNAPSHOT_PATH):
+        start = time.perf_counter()
+
+        # Skróty plików z chwili startu - klucz snapshotu i indeksów budowanych z danych run
+        hashes = source_hashes(front_path, full_path, daily_path)
+        self.source_hashes = MappingProxyType(dict(zip(("front", "full", "daily"), hashes)))
+
+        loaded = None
+        if snapshot_path:
+            loaded = load_snapshot(snapshot_path, front_path, full_path, daily_path, hashes)
+        self.from_snapshot = loaded is not None
+        if loaded is None:
+            loaded = parse_sources(front_path, full_path, daily_path)
+        front, full, daily, self.source_bytes = loaded
+
+        self._daily = WatchedFile(daily_path, self._load_daily, daily_check_interval, initial=freeze(daily))
+
+        self.front = freeze(front)
+        self.full = freeze(full)
+
+        full_by_name = {}
+        for row in self.full:
+            full_by_name.setdefault(row["nazwa"], row)
+
+        records = []
+        for pozycja, nazwa in enumerate(FUTHARK_ORDER, start=1):
+            if nazwa not in self.front:
+                continue
+            records.append(RuneRecord(
+                nazwa=nazwa,
+                pozycja=pozycja,
+                obraz=os.path.join(RUNE_PATH, f"{nazwa.split()[0].lower()}.jpg"),
+                front=self.front[nazwa],
+                full=full_by_name.get(nazwa),
+            ))
+
+        self.records = tuple(records)
+        self.by_name = MappingProxyType({record.nazwa: record for record in records})
+        self.by_position = MappingProxyType({record.pozycja: record for record in records})
+        self.index = RuneIndex(self.records)
+        self.load_seconds = time.perf_counter() - start
+
+    @staticmethod
+    def _load_daily(path):
+        """Wczytuje ponownie dane runy dnia po zmianie pliku (ValueError - zostają poprzednie dane)."""
+        daily, _ = read_json(path)
+        if not isinstance(daily, dict):
+            raise ValueError(f"Błąd w pliku {os.path.basename(path)}: Oczekiwano słownika z nazwami run jako kluczami")
+        return freeze(daily)
+
+    @property
+    def daily(self):
+        """Dane runy dnia (wszystkie runy), przeładowywane po zmianie pliku."""
+        return self._daily.get()
+
+    def daily_for(self, nazwa):
+        """Zwraca dane runy dnia dla podanej runy lub pusty słownik."""
+        return self.daily.get(nazwa, MappingProxyType({}))
+
+    def get(self, nazwa):
+        """Zwraca rekord runy o podanej nazwie lub None."""
+        return self.by_name.get(nazwa)
+
+    def find(self, query):
+        """Zwraca rekord runy po nazwie, aliasie lub nazwie z literówką albo None."""
+        nazwa = self.index.resolve(query)
+        return self.by_name.get(nazwa) if nazwa else None
+
+    def at_position(self, pozycja):
+        """Zwraca rekord runy na danej pozycji Futharku (1-24) lub None."""
+        return self.by_position.get(pozycja)
+
+    def stats(self):
+        """Zwraca czas ładowania i rozmiar danych."""
+        return {
+            "runes": len(self.records),
+            "full_records": len(self.full),
+            "aliases": len(self.index),
+            "daily_records": len(self.daily),
+            "daily_reloads": self._daily.reloads,
+            "daily_reload_failures": self._daily.failures,
+            "source_bytes": self.source_bytes,
+            "from_snapshot": self.from_snapshot,
+            "load_ms": round(self.load_seconds * 1000, 2),
+        }
+
+
+_REPOSITORY = None
+_REPOSITORY_LOCK = threading.Lock()
+
+
+def get_repository():
+    """Zwraca wspólne dla procesu repozytorium run, wczytując je przy pierwszym użyciu."""
+    global _REPOSITORY
+    if _REPOSITORY is None:
+        with _REPOSITORY_LOCK:
+            if _REPOSITORY is None:
+                repository = RuneRepository()
+                stats = repository.stats()
+                source = "snapshot" if stats["from_snapshot"] else "JSON"
+                print(f"Repozytorium run: {stats['runes']} run, {stats['full_records']} pełnych rekordów, "
+                      f"{stats['source_bytes'] / 1024:.0f} KB ({source}) w {stats['load_ms']} ms")
+                _REPOSITORY = repository
+    return _REPOSITORY
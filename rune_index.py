@@ -0,0 +1,89 @@
+###########################################################################
+#! "rune_index" - wyszukiwanie run po nazwie, aliasie lub z literówką
+###########################################################################
+
+import re
+from types import MappingProxyType
+
+from text import fold, edit_distance
+
+
+# Nagłówek każdego fragmentu krotki_opis (przed myślnikiem) to nazwy runy, np.
+# "Elhaz/Algiz – łoś, ochrona; eolh - łoś." -> Elhaz, Algiz, eolh
+_HEAD_SEPARATOR = re.compile(r"\s[–-]\s")
+_ALIAS_SEPARATOR = re.compile(r"[/,]")
+
+
+def aliases_from_short_description(krotki_opis):
+    """Zwraca nazwy runy zapisane w pierwszym zdaniu pola krotki_opis."""
+    aliases = []
+    for fragment in krotki_opis.split(".")[0].split(";"):
+        head = _HEAD_SEPARATOR.split(fragment, maxsplit=1)[0]
+        aliases.extend(alias.strip() for alias in _ALIAS_SEPARATOR.split(head) if alias.strip())
+    return aliases
+
+
+def max_distance_for(query):
+    """Dopuszczalna liczba literówek zależnie od długości zapytania."""
+    if len(query) <= 2:
+        return 0
+    return 1 if len(query) <= 4 else 2
+
+
+class RuneIndex:
+    """
+    Tablica aliasów run: znormalizowany alias -> kanoniczna nazwa runy.
+
+    Trafienia dokładne (po normalizacji wielkości liter i znaków diakrytycznych)
+    są odczytywane ze słownika w O(1). Pozostałe zapytania dopasowywane są
+    do najbliższego aliasu ograniczoną odległością edycyjną. Aliasy wspólne
+    dla kilku run są pomijane, żeby wynik był zawsze jednoznaczny.
+    """
+
+    def __init__(self, records):
+        aliases = {}
+        ambiguous = set()
+        canonical = {fold(record.nazwa): record.nazwa for record in records}
+
+        for record in records:
+            names = [record.nazwa]
+            if record.full:
+                names.append(record.full["nazwa"])
+                names.extend(aliases_from_short_description(record.full.get("krotki_opis", "")))
+            for name in names:
+                key = fold(name)
+                if not key or key in canonical:
+                    continue
+                if aliases.setdefault(key, record.nazwa) != record.nazwa:
+                    ambiguous.add(key)
+
+        for key in ambiguous:
+            del aliases[key]
+        aliases.update(canonical)
+        self.aliases = MappingProxyType(aliases)
+
+    def resolve(self, query):
+        """Zwraca kanoniczną nazwę runy dla zapytania lub None."""
+        key = fold(query or "")
+        if not key:
+            return None
+        nazwa = self.aliases.get(key)
+        if nazwa is not None:
+            return nazwa
+        return self._closest(key)
+
+    def _closest(self, key):
+        """Najbliższy alias w granicach max_distance_for; None przy braku lub remisie run."""
+        limit = max_distance_for(key)
+        best_distance = limit + 1
+        best = set()
+        for alias, nazwa in self.aliases.items():
+            distance = edit_distance(key, alias, limit)
+            if distance < best_distance:
+                best_distance, best = distance, {nazwa}
+            elif distance == best_distance and distance <= limit:
+                best.add(nazwa)
+        return best.pop() if len(best) == 1 else None
+
+    def __len__(self):
+        return len(self.aliases)
@@ -0,0 +1,229 @@
+###########################################################################
+#! "search" - wyszukiwanie pełnotekstowe w opisach run (indeks odwrotny, BM25)
+###########################################################################
+
+import os
+import html
+import math
+import time
+import marshal
+import threading
+from collections import Counter, defaultdict
+from typing import Mapping, NamedTuple
+
+from constants import SEARCH_INDEX_PATH
+from repository import get_repository
+from text import terms, term_spans
+
+
+# Wersja formatu indeksu na dysku - zmienić przy każdej zmianie tokenizacji lub pól
+SEARCH_INDEX_VERSION = 1
+
+# Parametry BM25
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Przeszukiwane pola: (źródło danych, pole, etykieta w wynikach)
+SEARCH_FIELDS = (
+    ("full", "opis", "Opis"),
+    ("full", "znaczenie", "Znaczenie"),
+    ("full", "interpretacja", "Interpretacja"),
+    ("full", "keywords", "Słowa kluczowe"),
+    ("front", "symbolika", "Symbolika"),
+    ("front", "potencjal", "Potencjał"),
+    ("front", "praktyczne_zastosowanie", "Praktyczne zastosowanie"),
+)
+
+# Długość fragmentu z podświetleniem (znaki przed i po pierwszym trafieniu)
+SNIPPET_BEFORE = 60
+SNIPPET_AFTER = 180
+
+
+def field_text(value):
+    """Zamienia wartość pola (tekst, lista, słownik) na jeden tekst do indeksowania."""
+    if isinstance(value, Mapping):
+        return "\n".join(f"{key}: {item}" for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return "\n".join(str(item) for item in value)
+    return str(value or "")
+
+
+class SearchHit(NamedTuple):
+    """Wynik wyszukiwania: runa, pole z najlepszym trafieniem i fragment HTML."""
+    nazwa: str
+    field: str
+    score: float
+    snippet: str
+
+
+class SearchIndex:
+    """
+    Indeks odwrotny opisów run z wagami BM25 policzonymi z góry.
+
+    Każdy dokument to jedno pole jednej runy. Lista wystąpień termu zawiera
+    gotowe wagi BM25 (idf * nasycona częstość), więc zapytanie to tylko suma
+    wag z kilku list, oraz pozycję pierwszego wystąpienia - fragment z
+    podświetleniem powstaje bez przeglądania całego dokumentu.
+    """
+
+    def __init__(self, docs, postings):
+        self.docs = docs            # [(nazwa, etykieta pola, tekst)]
+        self.postings = postings    # term -> [(id dokumentu, waga BM25, pozycja pierwszego wystąpienia)]
+
+    @classmethod
+    def build(cls, records):
+        """Buduje indeks z rekordów repozytorium run."""
+        docs, doc_terms, doc_first = [], [], []
+        for record in records:
+            sources = {"front": record.front, "full": record.full or {}}
+            for source, field, label in SEARCH_FIELDS:
+                text = field_text(sources[source].get(field))
+                if field == "keywords":
+                    text = text.replace(",", ", ")
+                if text.strip():
+                    spans = term_spans(text)
+                    first = {}
+                    for term, start, _ in spans:
+                        first.setdefault(term, start)
+                    docs.append((record.nazwa, label, text))
+                    doc_terms.append(Counter(term for term, _, _ in spans))
+                    doc_first.append(first)
+
+        lengths = [sum(counts.values()) for counts in doc_terms]
+        avg_length = sum(lengths) / len(lengths) if lengths else 0.0
+        document_frequency = Counter(term for counts in doc_terms for term in counts)
+
+        postings = defaultdict(list)
+        for doc_id, counts in enumerate(doc_terms):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / avg_length)
+            for term, tf in counts.items():
+                df = document_frequency[term]
+                idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                weight = idf * tf * (BM25_K1 + 1) / (tf + norm)
+                postings[term].append((doc_id, weight, doc_first[doc_id][term]))
+        return cls(docs, dict(postings))
+
+    def to_bytes(self, key):
+        """Serializuje indeks (marshal) razem z kluczem danych źródłowych."""
+        return marshal.dumps({"version": SEARCH_INDEX_VERSION, "key": key,
+                              "docs": self.docs, "postings": self.postings})
+
+    @classmethod
+    def from_bytes(cls, data, key):
+        """Odtwarza indeks z bajtów lub zwraca None, gdy wersja lub klucz się nie zgadza."""
+        try:
+            blob = marshal.loads(data)
+        except (ValueError, EOFError, TypeError):
+            return None
+        if blob.get("version") != SEARCH_INDEX_VERSION or blob.get("key") != key:
+            return None
+        return cls(blob["docs"], blob["postings"])
+
+    def rank(self, query, limit=10):
+        """Zwraca [(nazwa, wynik, id najlepszego dokumentu)] dla run pasujących do zapytania."""
+        scores = defaultdict(float)
+        for term in set(terms(query)):
+            for doc_id, weight, _ in self.postings.get(term, ()):
+                scores[doc_id] += weight
+
+        runes = {}
+        for doc_id, score in scores.items():
+            nazwa = self.docs[doc_id][0]
+            total, best_doc, best_score = runes.get(nazwa, (0.0, doc_id, score))
+            if score > best_score:
+                best_doc, best_score = doc_id, score
+            runes[nazwa] = (total + score, best_doc, best_score)
+
+        ranked = sorted(runes.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return [(nazwa, total, best_doc) for nazwa, (total, best_doc, _) in ranked]
+
+    def snippet(self, doc_id, query):
+        """Zwraca fragment dokumentu (HTML) z podświetlonymi trafieniami zapytania."""
+        text = self.docs[doc_id][2]
+        query_terms = set(terms(query))
+        offsets = [offset for term in query_terms
+                   for posting_doc, _, offset in self.postings.get(term, ()) if posting_doc == doc_id]
+        if not offsets:
+            return html.escape(text[:SNIPPET_BEFORE + SNIPPET_AFTER])
+
+        first_start = min(offsets)
+        window_start = max(0, first_start - SNIPPET_BEFORE)
+        window_end = min(len(text), first_start + SNIPPET_AFTER)
+        # Nie tniemy słów na brzegach fragmentu
+        if window_start > 0:
+            space = text.find(" ", window_start, first_start)
+            if space != -1:
+                window_start = space + 1
+        if window_end < len(text):
+            space = text.rfind(" ", first_start, window_end)
+            if space != -1:
+                window_end = space
+
+        # Podświetlenie wymaga tokenizacji tylko wybranego fragmentu
+        parts, position = [], window_start
+        for term, start, end in term_spans(text[window_start:window_end]):
+            if term not in query_terms:
+                continue
+            start, end = start + window_start, end + window_start
+            parts.append(html.escape(text[position:start]))
+            parts.append(f"<mark>{html.escape(text[start:end])}</mark>")
+            position = end
+        parts.append(html.escape(text[position:window_end]))
+
+        snippet = " ".join("".join(parts).split())
+        prefix = "… " if window_start > 0 else ""
+        suffix = " …" if window_end < len(text) else ""
+        return f"{prefix}{snippet}{suffix}"
+
+    def search(self, query, limit=10):
+        """Zwraca listę SearchHit posortowaną od najlepiej pasującej runy."""
+        return [
+            SearchHit(nazwa, self.docs[doc_id][1], score, self.snippet(doc_id, query))
+            for nazwa, score, doc_id in self.rank(query, limit)
+        ]
+
+    def __len__(self):
+        return len(self.postings)
+
+
+_SEARCH_INDEX = None
+_SEARCH_INDEX_LOCK = threading.Lock()
+
+
+def load_or_build_index(path=SEARCH_INDEX_PATH):
+    """Wczytuje indeks z dysku, jeśli pasuje do danych run, albo buduje go i zapisuje."""
+    repository = get_repository()
+    key = [repository.source_hashes["front"], repository.source_hashes["full"]]
+
+    try:
+        with open(path, "rb") as f:
+            index = SearchIndex.from_bytes(f.read(), key)
+        if index is not None:
+            return index, "dysk"
+    except OSError:
+        pass
+
+    index = SearchIndex.build(repository.records)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(index.to_bytes(key))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Nie zapisano indeksu wyszukiwania: {e}")
+    return index, "zbudowany"
+
+
+def get_search_index():
+    """Zwraca wspólny dla procesu indeks wyszukiwania, tworząc go przy pierwszym użyciu."""
+    global _SEARCH_INDEX
+    if _SEARCH_INDEX is None:
+        with _SEARCH_INDEX_LOCK:
+            if _SEARCH_INDEX is None:
+                start = time.perf_counter()
+                index, source = load_or_build_index()
+                print(f"Indeks wyszukiwania ({source}): {len(index.docs)} dokumentów, {len(index)} termów "
+                      f"w {(time.perf_counter() - start) * 1000:.1f} ms")
+                _SEARCH_INDEX = index
+    return _SEARCH_INDEX
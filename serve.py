@@ -0,0 +1,28 @@
+###########################################################################
+#! "serve" - start serwera Streamlit z rozgrzewaniem pamięci od razu po starcie procesu
+#  python serve.py [opcje streamlit run]  ==  streamlit run app.py [opcje]
+#  Streamlit wykonuje app.py dopiero przy pierwszej sesji; tu rozgrzewanie rusza
+#  w tym samym procesie przed serwerem, więc `python warmup.py --check` może
+#  posłużyć jako test gotowości jeszcze przed skierowaniem ruchu. Każdy proces
+#  (port) zapisuje stan do własnego pliku: python warmup.py --check --port <port>
+###########################################################################
+
+import os
+import sys
+
+from warmup import start_warmup, server_port, status_path_for
+
+
+def main():
+    from streamlit.web import cli
+
+    port = server_port(sys.argv[1:])
+    status_path = status_path_for(port)
+    print(f"Stan rozgrzewania (port {port}): {status_path}")
+    start_warmup(force=True, status_path=status_path)
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    return cli.main(args=["run", app_path, *sys.argv[1:]], prog_name="streamlit")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+###########################################################################
+#! "session" - kompaktowe zapisy losowań w stanie sesji
+###########################################################################
+
+import sys
+from typing import NamedTuple, Optional
+
+from draw import new_seed, draw_runes
+from supp import get_runes, rune_id
+
+
+class SpreadRecord(NamedTuple):
+    """
+    Wylosowany układ run zapisany w sesji.
+
+    Zamiast obiektów Runa przechowujemy numery run we wspólnej krotce
+    supp.get_runes (po jednym bajcie), maskę bitową odwróceń, typ układu
+    i ziarno losowania, które wystarcza do odtworzenia układu.
+    """
+    kind: str
+    ids: bytes
+    reversed_mask: int
+    seed: Optional[int] = None
+
+
+def encode_spread(kind, uklad, odwrocone, seed=None):
+    """Zapisuje układ run i ich orientacje jako SpreadRecord."""
+    mask = 0
+    for i, odwrocona in enumerate(odwrocone):
+        if odwrocona:
+            mask |= 1 << i
+    return SpreadRecord(kind, bytes(rune_id(runa) for runa in uklad), mask, seed)
+
+
+def draw_spread(kind, count, runy=None, seed=None):
+    """
+    Losuje `count` różnych run z orientacjami i zwraca SpreadRecord.
+
+    Bez ziarna losowane jest nowe; to samo ziarno zawsze daje ten sam układ.
+    """
+    runy = runy if runy is not None else get_runes()
+    seed = new_seed() if seed is None else seed
+    numery, odwrocone = draw_runes(count, seed, len(runy))
+    return encode_spread(kind, [runy[i] for i in numery], odwrocone, seed)
+
+
+def resolve_spread(record):
+    """Zwraca (lista run, lista orientacji) dla zapisanego układu."""
+    runy = get_runes()
+    uklad = [runy[i] for i in record.ids]
+    odwrocone = [bool(record.reversed_mask >> i & 1) for i in range(len(uklad))]
+    return uklad, odwrocone
+
+
+def deep_size(value, seen=None):
+    """
+    Przybliżony rozmiar obiektu w bajtach razem z obiektami, do których się odwołuje.
+
+    Każdy obiekt liczony jest raz. Uwzględnia kontenery, słowniki,
+    obiekty z __dict__ oraz __slots__.
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return size
+    if hasattr(value, "items"):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in value)
+    if hasattr(value, "__dict__"):
+        size += deep_size(vars(value), seen)
+    for name in getattr(type(value), "__slots__", ()):
+        if hasattr(value, name):
+            size += deep_size(getattr(value, name), seen)
+    return size
+
+
+def session_bytes(state):
+    """Rozmiar wartości stanu sesji w bajtach (bez obiektów współdzielonych przez proces)."""
+    shared = set()
+    # Wspólne runy i ich dane nie obciążają pojedynczej sesji
+    deep_size(get_runes(), shared)
+    return sum(deep_size(value, set(shared)) for value in dict(state).values())
@@ -0,0 +1,148 @@
+###########################################################################
+#! "similarity" - podobieństwo run (TF-IDF + cosinus) do panelu "powiązane runy"
+#  numpy importowane w funkcjach - ładowane dopiero przy pierwszym użyciu panelu
+###########################################################################
+
+import os
+import time
+import threading
+from collections import Counter
+from typing import Mapping
+
+from constants import SIMILARITY_PATH, RELATED_RUNES_COUNT
+from repository import get_repository
+from text import terms
+
+
+# Wersja formatu pliku - zmienić przy każdej zmianie pól, tokenizacji lub wag
+SIMILARITY_VERSION = 1
+
+# Największa liczba powiązanych run zapisywana na dysku
+SIMILARITY_TOP_K = 8
+
+
+def rune_text(record):
+    """Tekst runy do porównań: słowa kluczowe, symbolika i znaczenie."""
+    parts = [record.front.get("znaczenie", "")]
+    symbolika = record.front.get("symbolika", {})
+    if isinstance(symbolika, Mapping):
+        parts.extend(f"{key} {value}" for key, value in symbolika.items())
+    if record.full:
+        parts.append(record.full.get("keywords", "").replace(",", " "))
+    return "\n".join(parts)
+
+
+def tfidf_matrix(documents):
+    """
+    Zwraca macierz TF-IDF (dokumenty x termy) z wierszami znormalizowanymi L2.
+
+    TF jest logarytmiczne (1 + log tf), IDF wygładzone jak w scikit-learn.
+    """
+    import numpy as np
+
+    vocabulary = {}
+    rows, cols, counts = [], [], []
+    for row, document in enumerate(documents):
+        for term, count in Counter(terms(document)).items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+
+    tf = np.zeros((len(documents), len(vocabulary)))
+    tf[rows, cols] = 1 + np.log(counts)
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log((1 + len(documents)) / (1 + df)) + 1
+    weights = tf * idf
+
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return weights / np.where(norms == 0, 1, norms)
+
+
+class RuneSimilarity:
+    """Macierz podobieństwa run (cosinus wektorów TF-IDF) i gotowe listy najbliższych run."""
+
+    def __init__(self, names, matrix, top):
+        self.names = [str(name) for name in names]
+        self.matrix = matrix
+        self.top = top
+        self._positions = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def build(cls, records, top_k=SIMILARITY_TOP_K):
+        """Liczy macierz podobieństwa i listy top-k dla rekordów repozytorium."""
+        import numpy as np
+
+        vectors = tfidf_matrix([rune_text(record) for record in records])
+        matrix = vectors @ vectors.T
+
+        # Runa nie jest "powiązana" sama ze sobą
+        ranking = matrix.copy()
+        np.fill_diagonal(ranking, -np.inf)
+        top = np.argsort(-ranking, axis=1, kind="stable")[:, :top_k]
+        return cls([record.nazwa for record in records], matrix, top)
+
+    def save(self, path, key):
+        """Zapisuje macierz i listy top-k razem z kluczem danych źródłowych."""
+        import numpy as np
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, version=SIMILARITY_VERSION, key=np.array(key), names=np.array(self.names),
+                 matrix=self.matrix, top=self.top)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, key):
+        """Wczytuje zapisaną macierz lub zwraca None, gdy jej brak albo jest nieaktualna."""
+        import numpy as np
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["version"]) != SIMILARITY_VERSION or data["key"].tolist() != key:
+                    return None
+                return cls(data["names"].tolist(), data["matrix"], data["top"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def related(self, nazwa, count=RELATED_RUNES_COUNT):
+        """Zwraca [(nazwa, podobieństwo)] najbardziej powiązanych run."""
+        position = self._positions.get(nazwa)
+        if position is None:
+            return []
+        return [(self.names[j], float(self.matrix[position, j])) for j in self.top[position, :count]]
+
+
+_SIMILARITY = None
+_SIMILARITY_LOCK = threading.Lock()
+
+
+def load_or_build_similarity(path=SIMILARITY_PATH):
+    """Wczytuje macierz podobieństwa z dysku, jeśli pasuje do danych run, albo ją liczy i zapisuje."""
+    repository = get_repository()
+    key = [repository.source_hashes["front"], repository.source_hashes["full"]]
+
+    similarity = RuneSimilarity.load(path, key)
+    if similarity is not None:
+        return similarity, "dysk"
+
+    similarity = RuneSimilarity.build(repository.records)
+    try:
+        similarity.save(path, key)
+    except OSError as e:
+        print(f"Nie zapisano macierzy podobieństwa: {e}")
+    return similarity, "policzona"
+
+
+def get_similarity():
+    """Zwraca wspólną dla procesu macierz podobieństwa run."""
+    global _SIMILARITY
+    if _SIMILARITY is None:
+        with _SIMILARITY_LOCK:
+            if _SIMILARITY is None:
+                start = time.perf_counter()
+                similarity, source = load_or_build_similarity()
+                print(f"Podobieństwo run ({source}): {len(similarity.names)}x{len(similarity.names)} "
+                      f"w {(time.perf_counter() - start) * 1000:.1f} ms")
+                _SIMILARITY = similarity
+    return _SIMILARITY
@@ -0,0 +1,242 @@
+#?##########################################################################################################
+#TODO "simulate.py" - masowa symulacja losowań run i kontrola rozkładów (audyt losowania)
+#?##########################################################################################################
+"""
+Symulacja uruchamiana ręcznie z katalogu głównego projektu, np.:
+    python simulate.py --spread krag --draws 5000000
+    python simulate.py --count 3 --draws 1000000 --seed 7
+    python simulate.py --spread celtic --engine app --draws 200000
+
+Silnik "numpy" losuje wektorowo według tych samych zasad co aplikacja
+(różne runy bez zwracania, odwrócenie z prawdopodobieństwem REVERSE_CHANCE),
+silnik "app" wywołuje draw.draw_runes z aplikacji - wolniej, ale sprawdza
+dokładnie kod używany w aplikacji. Kod wyjścia 1, gdy któryś test chi-kwadrat
+odrzuca równomierność na poziomie --alpha.
+"""
+
+import sys
+import math
+import time
+import argparse
+
+from constants import REVERSE_CHANCE
+
+
+# Liczba losowań w jednej porcji silnika numpy (ogranicza pamięć: porcja x liczba run)
+CHUNK_DRAWS = 250_000
+
+
+#?##########################################################################################################
+#TODO#######################################################################################################
+#?                                                  Statystyka
+
+def chi2_sf(x, df):
+    """
+    P(X >= x) dla rozkładu chi-kwadrat o `df` stopniach swobody.
+
+    Regularyzowana górna niekompletna funkcja gamma Q(df/2, x/2): szereg dla
+    x < a + 1, w przeciwnym razie ułamek łańcuchowy (metoda Lentza).
+    """
+    if x <= 0:
+        return 1.0
+    a, x = df / 2, x / 2
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+
+    if x < a + 1:
+        term = total = 1 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1 - total * math.exp(log_prefix))
+
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10_000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, h * math.exp(log_prefix))
+
+
+def chi2_uniform(counts):
+    """Test zgodności liczności z rozkładem równomiernym: (chi2, stopnie swobody, p)."""
+    total = sum(counts)
+    expected = total / len(counts)
+    statistic = sum((count - expected) ** 2 for count in counts) / expected
+    df = len(counts) - 1
+    return statistic, df, chi2_sf(statistic, df)
+
+
+def chi2_binomial(successes, trials, p):
+    """Test odsetka sukcesów względem p (chi-kwadrat z 1 stopniem swobody): (chi2, p-wartość)."""
+    expected = trials * p
+    statistic = (successes - expected) ** 2 / expected + (successes - expected) ** 2 / (trials - expected)
+    return statistic, chi2_sf(statistic, 1)
+
+
+#?##########################################################################################################
+#TODO#######################################################################################################
+#?                                                  Silniki losowania
+
+class Tally:
+    """Liczniki symulacji: runa x pozycja oraz odwrócenia na pozycjach i runach."""
+
+    def __init__(self, count, population):
+        import numpy as np
+
+        self.count = count
+        self.population = population
+        self.draws = 0
+        self.by_position = np.zeros((count, population), dtype=np.int64)
+        self.reversed_by_position = np.zeros(count, dtype=np.int64)
+        self.reversed_by_rune = np.zeros(population, dtype=np.int64)
+
+    def add(self, ids, reversed_):
+        """Dolicza porcję losowań: tablice (losowania x pozycje) numerów run i odwróceń."""
+        import numpy as np
+
+        offsets = np.arange(self.count) * self.population
+        self.by_position += np.bincount((ids + offsets).ravel(),
+                                        minlength=self.count * self.population).reshape(self.count, self.population)
+        self.reversed_by_position += reversed_.sum(axis=0)
+        self.reversed_by_rune += np.bincount(ids[reversed_], minlength=self.population)
+        self.draws += len(ids)
+
+
+def simulate_numpy(tally, draws, seed):
+    """
+    Losowania wektorowe: częściowe tasowanie Fishera-Yatesa wszystkich wierszy naraz.
+
+    Krok i zamienia pozycję i z losową pozycją z zakresu [i, n), więc po k
+    krokach pierwsze k kolumn to k różnych run w losowej kolejności - jak
+    random.sample w aplikacji, ale k operacji na całej porcji zamiast pętli.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    k, n = tally.count, tally.population
+    remaining = draws
+    while remaining:
+        size = min(CHUNK_DRAWS, remaining)
+        rows = np.arange(size)
+        perm = np.tile(np.arange(n, dtype=np.int16), (size, 1))
+        for i in range(k):
+            j = rng.integers(i, n, size)
+            current = perm[:, i].copy()
+            perm[:, i] = perm[rows, j]
+            perm[rows, j] = current
+        tally.add(perm[:, :k].astype(np.int64), rng.random((size, k)) < REVERSE_CHANCE)
+        remaining -= size
+
+
+def simulate_app(tally, draws, seed):
+    """Losowania kodem aplikacji (draw.draw_runes), ziarna seed, seed + 1, ..."""
+    import numpy as np
+    from draw import draw_runes
+
+    remaining, next_seed = draws, seed
+    while remaining:
+        size = min(CHUNK_DRAWS, remaining)
+        ids = np.empty((size, tally.count), dtype=np.int64)
+        reversed_ = np.empty((size, tally.count), dtype=bool)
+        for row in range(size):
+            ids[row], reversed_[row] = draw_runes(tally.count, next_seed + row, tally.population)
+        tally.add(ids, reversed_)
+        remaining -= size
+        next_seed += size
+
+
+ENGINES = {"numpy": simulate_numpy, "app": simulate_app}
+
+
+#?##########################################################################################################
+#TODO#######################################################################################################
+#?                                                  Raport
+
+def report(tally, names, alpha):
+    """Wypisuje liczności, odsetki odwróceń i testy chi-kwadrat; zwraca liczbę odrzuconych testów."""
+    per_rune = tally.by_position.sum(axis=0)
+    picks = int(per_rune.sum())
+    failures = 0
+
+    print(f"\n{'runa':<12}{'liczba':>12}{'udział':>9}{'oczek.':>9}{'odwr.':>8}")
+    for name, count, reversed_count in zip(names, per_rune, tally.reversed_by_rune):
+        print(f"{name:<12}{count:>12,}{count / picks:>9.3%}{1 / tally.population:>9.3%}"
+              f"{reversed_count / count if count else 0:>8.2%}")
+
+    print(f"\n{'pozycja':<10}{'chi2':>10}{'df':>5}{'p':>10}{'odwr.':>9}{'p odwr.':>10}")
+    for position in range(tally.count):
+        statistic, df, p = chi2_uniform(tally.by_position[position].tolist())
+        reversed_count = int(tally.reversed_by_position[position])
+        _, p_reversed = chi2_binomial(reversed_count, tally.draws, REVERSE_CHANCE)
+        failures += (p < alpha) + (p_reversed < alpha)
+        print(f"{position + 1:<10}{statistic:>10.2f}{df:>5}{p:>10.4f}{reversed_count / tally.draws:>9.3%}"
+              f"{p_reversed:>10.4f}")
+
+    statistic, df, p = chi2_uniform(per_rune.tolist())
+    reversed_total = int(tally.reversed_by_position.sum())
+    reversed_statistic, p_reversed = chi2_binomial(reversed_total, picks, REVERSE_CHANCE)
+    failures += (p < alpha) + (p_reversed < alpha)
+    print(f"\nRuny ogółem:  chi2 = {statistic:.2f} (df {df}), p = {p:.4f}")
+    print(f"Odwrócenia:   {reversed_total / picks:.4%} (oczekiwane {REVERSE_CHANCE:.2%}), "
+          f"chi2 = {reversed_statistic:.2f} (df 1), p = {p_reversed:.4f}")
+
+    # Runy w jednym losowaniu muszą być różne - każda runa najwyżej raz na losowanie
+    if tally.count <= tally.population and (tally.by_position.sum(axis=0) > tally.draws).any():
+        print("BŁĄD: runa wylosowana więcej razy niż liczba losowań")
+        failures += 1
+    return failures
+
+
+def main(argv=None):
+    from spreads import SPREADS
+
+    parser = argparse.ArgumentParser(description="Symulacja losowań run i testy równomierności")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--spread", default="krag", choices=sorted(SPREADS),
+                        help="Układ ze spreads.SPREADS (liczba run z jego pozycji)")
+    target.add_argument("--count", type=int, help="Liczba run w losowaniu (zamiast --spread)")
+    parser.add_argument("--draws", type=int, default=1_000_000, help="Liczba losowań")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="numpy", help="Silnik losowania")
+    parser.add_argument("--seed", type=int, default=0, help="Ziarno symulacji")
+    parser.add_argument("--alpha", type=float, default=0.001, help="Poziom istotności testów")
+    args = parser.parse_args(argv)
+
+    from supp import get_runes
+
+    names = [runa.nazwa for runa in get_runes()]
+    if args.count is None:
+        count = len(SPREADS[args.spread].positions)
+        label = args.spread
+    else:
+        count, label = args.count, f"{args.count} run"
+    if not 0 < count <= len(names):
+        parser.error(f"liczba run musi być w zakresie 1-{len(names)}")
+
+    tally = Tally(count, len(names))
+    start = time.perf_counter()
+    ENGINES[args.engine](tally, args.draws, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"Układ {label}: {args.draws:,} losowań po {count} run, silnik {args.engine}, ziarno {args.seed}")
+    print(f"Czas: {elapsed:.2f} s, {args.draws / elapsed:,.0f} losowań/s ({args.draws * count / elapsed:,.0f} run/s)")
+    failures = report(tally, names, args.alpha)
+    print(f"\nTesty odrzucające równomierność (p < {args.alpha}): {failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+###########################################################################
+#! "spreads" - układy run zapisane jako dane i ich rysowanie jedną siatką CSS
+#  Nowy układ = nowy wpis w SPREADS (i w LAYOUT_SPREADS, jeśli ma mieć przycisk)
+###########################################################################
+
+from typing import NamedTuple
+
+import streamlit as st
+
+from constants import INTERACTIVE_WIDTH, SPREAD_RENDER_MODE, SPREAD_HTML_CACHE_MAX_BYTES
+from cache import LRUCache
+from models import ImageProcessor, HTMLRenderer
+from session import resolve_spread
+from compositor import compose_spread
+from templates import SPREAD_MEANING, SPREAD_GRID, SPREAD_CELL
+
+
+class Position(NamedTuple):
+    """Pozycja runy w układzie: etykieta i miejsce w siatce (wiersz i kolumna liczone od 1)."""
+    label: str
+    row: int
+    col: int
+
+
+class Spread(NamedTuple):
+    """
+    Układ run opisany danymi.
+
+    `positions` wyznacza kolejność losowanych run i ich miejsca w siatce
+    o `columns` kolumnach. `details` to numery pozycji, których opis można
+    pokazać przyciskiem pod układem.
+    """
+    key: str
+    button: str
+    title: str
+    meaning: str
+    columns: int
+    positions: tuple
+    details: tuple = ()
+
+
+SPREADS = {spread.key: spread for spread in (
+    Spread(
+        "jedna", "1 Runa", "Układ 1 Runa",
+        "Jedna runa – jedno objawienie. To serce twojego pytania, rdzeń sytuacji, klucz do zrozumienia.",
+        1,
+        (Position("Serce pytania", 1, 1),),
+    ),
+    Spread(
+        "triada", "3 Runy", "Układ 3 Runy – Triada Czasu",
+        "<em>Lewa</em> – przeszłość: duchowe korzenie pytania<br>"
+        "<em>Środek</em> – teraźniejszość: energie, które cię otaczają<br>"
+        "<em>Prawa</em> – przyszłość: możliwy kierunek lub ostrzeżenie",
+        3,
+        (Position("Przeszłość", 1, 1), Position("Teraźniejszość", 1, 2), Position("Przyszłość", 1, 3)),
+    ),
+    Spread(
+        "gwiazda", "5 Run", "Układ 5 Run – Gwiazda Przemian",
+        "1 – przeszłość, 2 – teraźniejszość, 3 – przyszłość<br>"
+        "4 – twoja siła duchowa, 5 – dar lub ostrzeżenie z zewnątrz",
+        5,
+        (Position("1. Przeszłość", 1, 1), Position("2. Teraźniejszość", 1, 2), Position("3. Przyszłość", 1, 3),
+         Position("4. Siła duchowa", 1, 4), Position("5. Dar lub ostrzeżenie", 1, 5)),
+    ),
+    Spread(
+        "krag", "8 Run", "Układ 8 Run – Krąg Życia",
+        "Osiem run tworzy pełen cykl: każda runa odsłania inny aspekt twojej ścieżki – "
+        "od narodzin idei po jej transformację.",
+        5,
+        (Position("1. Teraz", 1, 2), Position("2. Przeszłość", 1, 3), Position("3. Przyszłość", 1, 4),
+         Position("4. Przeszkody", 2, 1), Position("5. Wzmocnienia", 2, 5),
+         Position("6. Ludzie", 3, 2), Position("7. Rada", 3, 3), Position("8. Wynik", 3, 4)),
+        details=(3, 4),
+    ),
+    Spread(
+        "celtic", "Krzyż celtycki", "Krzyż celtycki", "",
+        3,
+        (Position("Obecna sytuacja", 1, 2), Position("Wyzwania", 2, 1),
+         Position("Przeszłość wpływająca na obecną sytuację", 2, 3), Position("Potencjalna przyszłość", 3, 2)),
+    ),
+)}
+
+# Układy dostępne przyciskami na stronie "Rozkłady Runiczne" (w tej kolejności)
+LAYOUT_SPREADS = ("jedna", "triada", "gwiazda", "krag")
+
+# Gotowy HTML siatek zapisanych układów (tryb "grid"), wspólny dla wszystkich sesji
+SPREAD_HTML_CACHE = LRUCache(SPREAD_HTML_CACHE_MAX_BYTES)
+
+
+def spread_html(spread, uklad, odwrocone, max_width=INTERACTIVE_WIDTH):
+    """Zwraca cały układ (opis i siatkę run) jako jeden blok HTML."""
+    cells = []
+    for position, runa, odwrocona in zip(spread.positions, uklad, odwrocone):
+        cells.append(SPREAD_CELL.substitute(
+            row=position.row,
+            col=position.col,
+            image=runa.interaktywny_obraz_html(odwrocona, max_width),
+            label=position.label,
+            nazwa=runa.get_nazwa_odwrocona() if odwrocona else runa.nazwa,
+        ))
+    html = SPREAD_GRID.substitute(columns=spread.columns, cells="".join(cells))
+    if spread.meaning:
+        html = SPREAD_MEANING.substitute(title=spread.title, meaning=spread.meaning) + html
+    return html
+
+
+def spread_for(record):
+    """Zwraca układ zapisanego losowania lub None, gdy zapis nie pasuje do żadnego układu."""
+    spread = SPREADS.get(record.kind)
+    if spread is None or len(spread.positions) != len(record.ids):
+        return None
+    return spread
+
+
+def grid_html(spread, record, max_width=INTERACTIVE_WIDTH):
+    """HTML siatki zapisanego układu - budowany raz na losowanie (i tryb obrazów)."""
+    def build():
+        uklad, odwrocone = resolve_spread(record)
+        # Obrazy run przygotowywane są wcześniej, równolegle (poza runami rysowanymi z atlasu)
+        size = (max_width, max_width)
+        jobs = [(runa, size, odwrocona) for runa, odwrocona in zip(uklad, odwrocone)
+                if not runa.uses_atlas(odwrocona, max_width)]
+        if jobs:
+            ImageProcessor.report_errors(ImageProcessor.prepare_batch(jobs)[1])
+        return spread_html(spread, uklad, odwrocone, max_width)
+
+    key = (record.kind, record.ids, record.reversed_mask, max_width, HTMLRenderer.render_mode)
+    return SPREAD_HTML_CACHE.get_or_create(key, build)
+
+
+def render_spread(record, max_width=INTERACTIVE_WIDTH, mode=None):
+    """
+    Wyświetla zapisany w sesji układ i przycisk pobrania jego obrazu.
+
+    W trybie "image" przeglądarka dostaje jeden złożony obraz JPEG (jedno
+    zapytanie zamiast osobnego obrazu każdej runy), w trybie "grid" - siatkę
+    CSS z obrazami run wysłaną jedną deltą. Oba powstają raz na losowanie,
+    a kolejne przebiegi skryptu biorą je z pamięci podręcznej. W trybie "grid"
+    obraz JPEG jest składany dopiero na prośbę użytkownika (do pobrania).
+    """
+    spread = SPREADS[record.kind]
+    mode = mode or SPREAD_RENDER_MODE
+
+    if mode == "image":
+        image = compose_spread(spread, record, max_width)
+        if spread.meaning:
+            st.markdown(SPREAD_MEANING.substitute(title=spread.title, meaning=spread.meaning),
+                        unsafe_allow_html=True)
+        st.image(image, caption=spread.title)
+    else:
+        HTMLRenderer._send(grid_html(spread, record, max_width), images=len(record.ids))
+        # Prośba dotyczy tylko bieżącego losowania - nowy układ znów pokazuje przycisk
+        requested = f"download_requested_{spread.key}"
+        if (st.session_state.get(requested) != record
+                and not st.button("Przygotuj obraz układu (JPG)", key=f"prepare_{spread.key}")):
+            return
+        st.session_state[requested] = record
+        image = compose_spread(spread, record, max_width)
+
+    st.download_button("Pobierz układ (JPG)", image, file_name=f"uklad_{spread.key}.jpg",
+                       mime="image/jpeg", key=f"download_{spread.key}")
@@ -127,6 +127,47 @@ button[kind="primary"]:hover {
     background: #FFD700;
 }
 
+/* Highlighted matches in search results */
+.search-hit mark {
+    background: #E8C57A;
+    color: #0E1117;
+    border-radius: 3px;
+    padding: 0 2px;
+}
+
+/* Rune spreads: meaning box and CSS grid of positions (spreads.py) */
+.spread-meaning {
+    background-color: rgba(193, 71, 233, 0.1);
+    padding: 20px;
+    border-radius: 12px;
+    box-shadow: 0 0 10px #C147E9;
+    margin-bottom: 30px;
+}
+.spread-meaning p {
+    color: #FFD700;
+    font-size: 18px;
+    text-align: center;
+}
+.spread-grid {
+    display: grid;
+    gap: 24px 16px;
+    align-items: start;
+    justify-items: center;
+}
+.spread-cell {
+    text-align: center;
+}
+.spread-label, .spread-name {
+    margin: 6px 0 0;
+    color: #E8C57A;
+}
+.spread-label {
+    font-size: 16px;
+}
+.spread-name {
+    font-size: 14px;
+}
+
 /* Glow headers and text for consistency */
 h1, h2, h3, h4, h5, h6, p, span, label {
     text-shadow: 0 0 5px rgba(255, 255, 255, 0.1);
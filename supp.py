@@ -4,118 +4,50 @@
 
 import os
 import json
-import random
+import datetime
+import threading
 from PIL import Image
 import streamlit as st
-from constants import MAIN_PATH, RUNE_PATH, IMG_WIDTH, IMG_HEIGHT, DATA_MAIN_PATH, DATA_FRONT_PATH, COLORS
-from models import Runa, RunaPelna
-from dotenv import load_dotenv
-import openai
+from constants import MAIN_PATH, DATA_MAIN_PATH, COLORS, HERO_CACHE_MAX_BYTES, BANNERS
+from models import Runa, RunaPelna, ImageProcessor
+from cache import LRUCache
+from assets import ASSET_MANIFEST
+from repository import get_repository
+from draw import daily_rune
 
 
 def load_rune_data_from_json(path=DATA_MAIN_PATH):
+    """Zwraca pełne rekordy run; domyślny plik pochodzi ze wspólnego repozytorium."""
+    if path == DATA_MAIN_PATH:
+        return get_repository().full
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
 def init_rune_data():
     """Inicjalizuje dane run z odpowiednich plików"""
-    # Ładowanie danych frontendowych
     try:
-        with open(DATA_FRONT_PATH, encoding="utf-8") as f:
-            frontend_data = json.load(f)
-        is_valid, message = validate_rune_data(frontend_data, is_frontend=True)
-        if not is_valid:
-            st.error(f"Błąd w pliku runes_data.json: {message}")
-            return None, None
+        repository = get_repository()
     except Exception as e:
-        st.error(f"Nie można załadować pliku runes_data.json: {e}")
+        st.error(f"Nie można załadować danych run: {e}")
         return None, None
-    
-    # Ładowanie pełnych danych
-    try:
-        with open(DATA_MAIN_PATH, "r", encoding="utf-8") as f:
-            full_data = json.load(f)
-        is_valid, message = validate_rune_data(full_data, is_frontend=False)
-        if not is_valid:
-            st.error(f"Błąd w pliku big_data_rune.json: {message}")
-            return frontend_data, None
-    except Exception as e:
-        st.error(f"Nie można załadować pliku big_data_rune.json: {e}")
-        return frontend_data, None
-    
-    return frontend_data, full_data
+    return repository.front, repository.full
 
 
 def load_all_runes():
     """Ładuje uproszczone dane run do wyświetlania w interfejsie"""
     try:
-        with open(DATA_FRONT_PATH, encoding="utf-8") as f:
-            data = json.load(f)
-        print(f"Załadowano {len(data)} rekordów z runes_data.json")
-        
-        # Standardowa kolejność run w Futharku
-        futhark_order = [
-            "Fehu", "Uruz", "Thurisaz", "Ansuz", "Raidho", 
-            "Kenaz", "Gebo", "Wunjo", "Hagalaz", "Nauthiz", 
-            "Isa", "Jera", "Eihwaz", "Perthro", "Algiz", 
-            "Sowilo", "Tiwaz", "Berkano", "Ehwaz", "Mannaz",
-            "Laguz", "Ingwaz", "Dagaz", "Othala"
-        ]
-        
-        runes = []
-        for nazwa in futhark_order:
-            if nazwa in data:
-                # Używamy poprawnej ścieżki do obrazów run
-                obraz_path = os.path.join(RUNE_PATH, f"{nazwa.split()[0].lower()}.jpg")
-                
-                # Tworzymy obiekt Runa i ładujemy opis
-                runa = Runa(nazwa=nazwa, obraz=obraz_path)
-                runa.załaduj_opis()
-                
-                runes.append(runa)
-        
-        print(f"Utworzono {len(runes)} obiektów Runa")
-        return runes
+        return create_runes_list()
     except Exception as e:
-        print(f"Błąd podczas ładowania run z runes_data.json: {e}")
+        print(f"Błąd podczas ładowania run z front_data_rune.json: {e}")
         st.error(f"Błąd ładowania run: {e}")
         return []
 
 
-
 def load_full_rune_data():
     """Ładuje pełne dane run do interpretacji"""
     try:
-        with open(DATA_MAIN_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        print(f"Załadowanych rekordów z big_data_rune.json: {len(data)}")
-        
-        runes = []
-        for r in data:
-            try:
-                # Upewniamy się, że wszystkie wymagane pola istnieją
-                required_fields = ["nazwa", "krotki_opis", "opis", "znaczenie", 
-                                  "interpretacja", "keywords", "url_zdjecia", 
-                                  "url", "aett", "pozycja"]
-                
-                # Sprawdzamy czy obiekt ma wszystkie wymagane pola
-                has_all_fields = all(field in r for field in required_fields)
-                
-                if not has_all_fields:
-                    missing = [field for field in required_fields if field not in r]
-                    print(f"Brakujące pola dla runy {r.get('nazwa', 'bez nazwy')}: {missing}")
-                    continue
-                
-                # Tworzymy obiekt RunaPelna
-                runa = RunaPelna(**r)
-                runes.append(runa)
-            except Exception as e:
-                print(f"Błąd podczas przetwarzania runy {r.get('nazwa', 'bez nazwy')}: {e}")
-                
-        print(f"Pomyślnie załadowano {len(runes)} run z big_data_rune.json")
-        return runes
+        data = get_repository().full
     except FileNotFoundError:
         error_msg = "Plik big_data_rune.json nie znaleziony!"
         print(error_msg)
@@ -132,88 +64,119 @@ def load_full_rune_data():
         st.error(error_msg)
         return []
 
+    runes = []
+    for r in data:
+        try:
+            runes.append(RunaPelna(**r))
+        except Exception as e:
+            print(f"Błąd podczas przetwarzania runy {r.get('nazwa', 'bez nazwy')}: {e}")
+    return runes
+
+
+class HeroImageService:
+    """
+    Obrazy główne (banery) stron, przygotowywane raz na proces.
+
+    Każdy baner jest wczytywany dopiero przy pierwszym użyciu, a gotowe bajty
+    JPEG trafiają do pamięci podręcznej z kluczem zawierającym mtime pliku,
+    więc podmiana obrazu na dysku unieważnia wpis bez restartu.
+    """
+
+    def __init__(self, folder=MAIN_PATH, banners=None, max_bytes=HERO_CACHE_MAX_BYTES):
+        self.folder = folder
+        self.banners = banners if banners is not None else BANNERS
+        self.cache = LRUCache(max_bytes)
+
+    def get(self, name):
+        """Zwraca bajty JPEG banera o podanej nazwie lub None, jeśli go brak."""
+        if name not in self.banners:
+            raise KeyError(f"Nieznany baner: {name}")
+        path = os.path.join(self.folder, f"{name}.jpg")
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        size = self.banners[name]
+        return self.cache.get_or_create((name, mtime, size), lambda: self._render(path, size))
+
+    @staticmethod
+    def _render(path, size):
+        """Przygotowuje baner: gotowy wariant z data/cache, oryginalny plik albo przeskalowany obraz."""
+        if size is None:
+            with open(path, "rb") as f:
+                return f.read()
+        variant_path = ASSET_MANIFEST.lookup(path, size)
+        if variant_path:
+            with open(variant_path, "rb") as f:
+                return f.read()
+        with Image.open(path) as img:
+            img = img.convert("RGB").resize(size)
+        return ImageProcessor.to_jpeg_bytes(img)
+
+
+# Wspólny dla procesu serwis banerów
+HERO_IMAGES = HeroImageService()
+
 
 def load_main_images():
-    """Ładuje główne obrazy z folderu i przekształca je do odpowiednich rozmiarów."""
+    """Zwraca główny baner stron (maina) jako bajty JPEG."""
     try:
-        main_jpg = [f for f in os.listdir(MAIN_PATH) if f.endswith('.jpg')]
-        if not main_jpg:
+        if (image := HERO_IMAGES.get("maina")) is None:
             st.warning("Brak dostępnych obrazów w folderze.")
-            return None
-
-        imain = {os.path.splitext(file)[0]: Image.open(os.path.join(MAIN_PATH, file)) for file in main_jpg}
-
-        # Zmień rozmiar głównego obrazu
-        if "maina" in imain:
-            return imain["maina"].resize((IMG_WIDTH, IMG_HEIGHT))
-        return None
+        return image
     except Exception as e:
         st.error(f"Wystąpił błąd podczas ładowania obrazów: {e}")
         return None
 
 
-def validate_rune_data(data, is_frontend=False):
-    """Sprawdza poprawność struktury danych run"""
-    if is_frontend:
-        # Sprawdzenie struktury runes_data.json (baza frontendowa)
-        if not isinstance(data, dict):
-            return False, "Oczekiwano słownika z nazwami run jako kluczami"
-        
-        for rune_name, rune_data in data.items():
-            required_fields = ["znaczenie", "symbolika", "energia", "praktyczne_zastosowanie"]
-            for field in required_fields:
-                if field not in rune_data:
-                    return False, f"Brak wymaganego pola '{field}' dla runy '{rune_name}'"
-    else:
-        # Sprawdzenie struktury all_data_runes.json (baza główna)
-        if not isinstance(data, list):
-            return False, "Oczekiwano listy obiektów run"
-        
-        for rune in data:
-            required_fields = ["nazwa", "krotki_opis", "opis", "znaczenie", 
-                             "interpretacja", "keywords", "url_zdjecia", "url", "aett", "pozycja"]
-            for field in required_fields:
-                if field not in rune:
-                    return False, f"Brak wymaganego pola '{field}' dla runy '{rune.get('nazwa', 'bez nazwy')}'"
-    
-    return True, "Dane są poprawne"
-
-from PIL import Image
-import io
-
 def load_volva_image():
+    """Zwraca obraz Völvy jako bajty JPEG."""
     try:
-        # Otwieranie obrazu z ignorowaniem błędów
-        with Image.open("./data/img_main/volva3.jpg") as img:
-            img = img.convert("RGB")  # Konwertuj do RGB, jeśli to konieczne
-            img.load()  # Wczytaj obraz
-        return img
+        return HERO_IMAGES.get("volva3")
     except OSError:
         print("Błąd: Plik obrazu jest uszkodzony lub niekompletny.")
         return None
 
 
+_RUNES = None
+_RUNES_LOCK = threading.Lock()
+
+
+def get_runes():
+    """Zwraca wspólną dla procesu krotkę niezmiennych obiektów Runa (tworzoną raz)."""
+    global _RUNES
+    if _RUNES is None:
+        with _RUNES_LOCK:
+            if _RUNES is None:
+                _RUNES = tuple(Runa.from_record(record) for record in get_repository().records)
+    return _RUNES
+
+
+def rune_id(runa):
+    """Zwraca numer runy we wspólnej krotce run (kolejność Futharku) - tak zapisujemy ją w sesji."""
+    return get_runes().index(runa)
+
+
+def rune_by_id(numer):
+    """Zwraca wspólny obiekt Runa o podanym numerze."""
+    return get_runes()[numer]
+
+
 def create_runes_list():
-    """Tworzy listę obiektów reprezentujących runy nordyckie i ich atrybuty."""
-    runy = []
-    for nazwa in [
-        "Fehu", "Uruz", "Thurisaz", "Ansuz", "Raidho", 
-        "Kenaz", "Gebo", "Wunjo", "Hagalaz", "Nauthiz", 
-        "Isa", "Jera", "Eihwaz", "Perthro", "Algiz", 
-        "Sowilo", "Tiwaz", "Berkano", "Ehwaz", "Mannaz",
-        "Laguz", "Ingwaz", "Dagaz", "Othala"
-    ]:
-        runa = Runa(nazwa, os.path.join(RUNE_PATH, f"{nazwa.split()[0].lower()}.jpg"))
-        runa.załaduj_opis()
-        runy.append(runa)
-    return runy
-
-
-def losuj_rune(runy):
-    """Losuje runę i zapisuje ją w stanie sesji."""
+    """Zwraca runy nordyckie w kolejności Futharku - te same obiekty dla wszystkich sesji."""
+    return get_runes()
+
+
+def losuj_rune(runy, salt=""):
+    """
+    Wyznacza runę dnia i zapisuje ją w stanie sesji.
+
+    Runa zależy tylko od dzisiejszej daty i opcjonalnej soli (np. imienia),
+    więc przez cały dzień jest ta sama i wspólna dla wszystkich sesji.
+    """
     try:
-        wylosowana = random.choice(runy)
-        st.session_state["Runa dnia"] = wylosowana  # Zapisz do stanu sesji
+        wylosowana = runy[daily_rune(datetime.date.today(), salt, len(runy))]
+        st.session_state["Runa dnia"] = rune_id(wylosowana)  # Zapisz numer runy do stanu sesji
     except Exception as e:
         st.error(f"Wystąpił błąd przy losowaniu runy: {e}")
 
@@ -0,0 +1,102 @@
+###########################################################################
+#! "templates" - gotowe szablony HTML opisów run (jeden blok = jedna delta)
+###########################################################################
+
+from string import Template
+from functools import lru_cache
+from collections.abc import Mapping
+
+from constants import COLORS
+from supp import rune_by_id
+from similarity import get_similarity
+
+
+def _compile(html):
+    """Kompiluje szablon raz przy imporcie, od razu wstawiając kolory motywu."""
+    return Template(Template(html).safe_substitute(accent=COLORS["accent"], text=COLORS["text"]))
+
+
+# Elementy opisu runy - bez wcięć i pustych linii, żeby Markdown nie uznał ich za kod
+SECTION = _compile("<h4 style='color: $accent;'>$title</h4>$body")
+MAPPING_ITEM = _compile("<p style='color: $text;'>▪️ <b>$key:</b> $value</p>")
+LIST_ITEM = _compile("<p style='color: $text;'>▪️ $item</p>")
+PARAGRAPH = _compile("<p style='color: $text;'>$content</p>")
+HEADER_ROW = _compile("<p style='color: $accent; font-size: 30px;'>$label:$gap"
+                      "<span style='color: $text; font-weight: bold;'>$value</span></p>")
+RELATED_ITEM = _compile("<b>$nazwa</b> <span style='font-size: 13px;'>($score)</span>")
+RELATED = _compile("<p style='color: $text;'><span style='color: $accent;'>Powiązane runy:</span> $items</p>")
+SPACER = '<div style="height: 20px;"></div>'
+HEADER = _compile("<h1 style='color: $accent; font-size: 66px;'>$nazwa</h1>$rows")
+
+# Układ run: opis znaczenia i siatka CSS z runami na pozycjach
+SPREAD_MEANING = _compile("<div class='spread-meaning'><p><strong>$title</strong><br>$meaning</p></div>")
+SPREAD_GRID = _compile("<div class='spread-grid' style='grid-template-columns: repeat($columns, minmax(0, 1fr));'>"
+                       "$cells</div>")
+SPREAD_CELL = _compile("<div class='spread-cell' style='grid-row: $row; grid-column: $col;'>$image"
+                       "<p class='spread-label'>$label</p><p class='spread-name'>$nazwa</p></div>")
+
+# Sekcje opisu: pełny opis i skrócony (przeglądanie run)
+ALL_SECTIONS = (
+    ("Symbol", "symbol"),
+    ("Aett", "aett"),
+    ("Pozycja", "pozycja"),
+    ("Znaczenie", "znaczenie"),
+    ("Symbolika", "symbolika"),
+    ("Potencjał", "potencjal"),
+    ("Praktyczne zastosowanie", "prakt_zastosowanie"),
+    ("Dodatkowe informacje", "dodatkowe_info"),
+)
+SHORT_SECTIONS = (
+    ("Znaczenie", "znaczenie"),
+    ("Symbolika", "symbolika"),
+    ("Potencjał", "potencjal"),
+)
+
+# Wiersze nagłówka runy: etykieta i odstęp wyrównujący wartości
+HEADER_ROWS = (
+    ("Symbol", "symbol", 6),
+    ("Aett", "aett", 13),
+    ("Pozycja", "pozycja", 6),
+)
+
+
+def section_body(content):
+    """HTML treści sekcji: słownik, lista lub tekst."""
+    if isinstance(content, Mapping):
+        return "".join(MAPPING_ITEM.substitute(key=key, value=value) for key, value in content.items())
+    if isinstance(content, (list, tuple)):
+        return "".join(LIST_ITEM.substitute(item=item) for item in content)
+    return PARAGRAPH.substitute(content=content)
+
+
+@lru_cache(maxsize=None)
+def rune_details_html(numer, show_all=True):
+    """Opis runy o podanym numerze jako jeden blok HTML (zapamiętany - runy są niezmienne)."""
+    runa = rune_by_id(numer)
+    sections = ALL_SECTIONS if show_all else SHORT_SECTIONS
+    return "".join(
+        SECTION.substitute(title=title, body=section_body(content))
+        for title, name in sections
+        if (content := getattr(runa, name))
+    )
+
+
+@lru_cache(maxsize=None)
+def rune_header_html(numer):
+    """Nazwa, symbol, aett i pozycja runy jako jeden blok HTML."""
+    runa = rune_by_id(numer)
+    rows = "".join(
+        HEADER_ROW.substitute(label=label, gap="&nbsp;" * gap, value=getattr(runa, name))
+        for label, name, gap in HEADER_ROWS
+    )
+    return HEADER.substitute(nazwa=runa.nazwa, rows=rows)
+
+
+@lru_cache(maxsize=None)
+def related_runes_html(numer):
+    """Wiersz "Powiązane runy" dla runy o podanym numerze (pusty napis, gdy brak powiązań)."""
+    related = get_similarity().related(rune_by_id(numer).nazwa)
+    if not related:
+        return ""
+    items = " · ".join(RELATED_ITEM.substitute(nazwa=nazwa, score=f"{score:.0%}") for nazwa, score in related)
+    return RELATED.substitute(items=items)
@@ -0,0 +1,100 @@
+###########################################################################
+#! "text" - normalizacja tekstu do wyszukiwania i dopasowywania nazw
+###########################################################################
+
+import re
+import unicodedata
+from functools import lru_cache
+
+
+# Litery, których NFKD nie rozkłada na literę bazową i znak diakrytyczny
+_EXTRA_LETTERS = str.maketrans({
+    "ł": "l", "Ł": "L", "ø": "o", "Ø": "O", "æ": "ae", "Æ": "AE",
+    "ð": "d", "Ð": "D", "þ": "th", "Þ": "TH", "ß": "ss",
+})
+
+
+def strip_diacritics(text):
+    """Zwraca tekst bez znaków diakrytycznych (ł -> l, ś -> s), z zachowaniem wielkości liter."""
+    text = unicodedata.normalize("NFKD", text.translate(_EXTRA_LETTERS))
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def fold(text):
+    """Zwraca tekst małymi literami, bez znaków diakrytycznych i nadmiarowych spacji."""
+    return " ".join(strip_diacritics(text).lower().split())
+
+
+# Najczęstsze słowa, które nie niosą treści (po normalizacji fold)
+STOPWORDS = frozenset("""
+a aby ale ani bez bo by byc co czy dla do gdy i ich im jak jako jest jego jej
+juz ku lub ma moze na nad nie niz o od oraz po pod przed przez przy sa sie ta
+tak te tego tej to tu ty u w we wiec z za ze
+""".split())
+
+# Końcówki fleksyjne odcinane przez lekki stemmer (od najdłuższych)
+_SUFFIXES = sorted("""
+owaniami owaniach owania owanie owaniu
+osciami osciach osci osc
+ami ach ego emu owi ymi imi ich ych iej ej
+om ow em ie ia iu ym im a e i o u y
+""".split(), key=len, reverse=True)
+_MIN_STEM = 3
+
+_WORD = re.compile(r"\w+")
+
+
+def stem(token):
+    """Lekki stemmer polski: odcina jedną końcówkę, zostawiając co najmniej 3 litery."""
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM:
+            return token[:-len(suffix)]
+    return token
+
+
+@lru_cache(maxsize=65536)
+def word_term(word):
+    """Zwraca term dla pojedynczego słowa lub None dla słowa pomijanego."""
+    word = fold(word)
+    if not word or word in STOPWORDS:
+        return None
+    return stem(word)
+
+
+def term_spans(text):
+    """Zwraca (term, początek, koniec) dla słów oryginalnego tekstu."""
+    spans = []
+    for match in _WORD.finditer(text):
+        term = word_term(match.group())
+        if term is not None:
+            spans.append((term, match.start(), match.end()))
+    return spans
+
+
+def terms(text):
+    """Zwraca termy wyszukiwania: znormalizowane i przycięte słowa bez słów pomijanych."""
+    return [term for term, _, _ in term_spans(text)]
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Odległość Levenshteina między napisami, liczona tylko do `max_distance`.
+
+    Zwraca max_distance + 1, gdy odległość jest większa - wtedy obliczenia
+    kończą się, gdy tylko cały wiersz tablicy przekroczy limit.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous[-1], max_distance + 1)
@@ -2,29 +2,32 @@
 volva.py - Mistyczna wieszczka, która interpretuje runy i udziela magicznych odpowiedzi.
 """
 
-import random
 import streamlit as st
-import openai
 from typing import Optional, Tuple
 import os
 
 from styles import load_css
-from supp import load_volva_image, load_all_runes, load_rune_data_from_json, get_api_key
+from supp import load_volva_image, load_all_runes, get_api_key
 from constants import COLORS
 from models import RunaPelna
+from draw import new_seed, draw_runes
 
-# Preload assets
-volva_image = load_volva_image()
-runes = load_all_runes()
-rune_data = load_rune_data_from_json()
+
+def _openai(api_key):
+    """Importuje bibliotekę openai dopiero przy pierwszym pytaniu do Völvy i ustawia klucz."""
+    import openai
+
+    openai.api_key = api_key
+    return openai
 
 
 class VolvaMystyczna:
     """Klasa obsługująca funkcjonalność i zachowanie wieszczki Volvy."""
     
     def __init__(self):
-        self.image = volva_image
-        self.runes = runes
+        # Obraz i runy są wspólne dla procesu (HERO_IMAGES, supp.get_runes) - tu tylko odwołania
+        self.image = load_volva_image()
+        self.runes = load_all_runes()
         self.colors = {
             "primary": "#C147E9",
             "secondary": "#FFD700",
@@ -185,8 +188,8 @@ class VolvaMystyczna:
             if answer_mode == "Odpowiedź Volvy bez runy":
                 prophecy = self._generate_volva_response(question)
             else:
-                selected_rune = random.choice(self.runes)
-                is_reversed = random.random() < 0.33  # 33% szans na odwróconą runę
+                (numer,), (is_reversed,) = draw_runes(1, new_seed(), len(self.runes))
+                selected_rune = self.runes[numer]
                 prophecy = self._interpret_rune_with_question(question, selected_rune, is_reversed)
                 
         return prophecy, selected_rune, is_reversed
@@ -197,9 +200,8 @@ class VolvaMystyczna:
         if not api_key:
             return "🌙 Potrzebuję klucza API, by wsłuchać się w szept run... 🌙"
         
-        openai.api_key = api_key
-        
         try:
+            openai = _openai(api_key)
             prompt = f"""
             Wciel się w Völvę - nordycką wieszczkę, mistyczkę starożytnego świata skandynawskiego.
             Odpowiedz na pytanie użytkownika: '{question}'
@@ -241,9 +243,8 @@ class VolvaMystyczna:
         if not api_key:
             return "🔮 Potrzebuję klucza API by odczytać mądrość run..."
         
-        openai.api_key = api_key
-        
         try:
+            openai = _openai(api_key)
             prompt = f"""
             Jako Völva, nordycka wieszczka run, zinterpretuj runę {runa.nazwa} 
             w kontekście pytania: '{question}'. 
@@ -0,0 +1,230 @@
+###########################################################################
+#! "warmup" - rozgrzewanie pamięci podręcznych w tle i stan gotowości procesu
+#  python warmup.py --check [--port 8501]  -> kod 0, gdy rozgrzewanie procesu na tym porcie się zakończyło
+#  python warmup.py --run    -> rozgrzewanie na pierwszym planie (pomiar czasu)
+###########################################################################
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+
+from constants import (WARMUP_ENABLED, WARMUP_STATUS_PATH, WARMUP_STATUS_TEMPLATE, DEFAULT_SERVER_PORT,
+                       BANNERS, RUNE_VARIANT_SIZES, IMAGE_BATCH_EXECUTOR, IMAGE_BATCH_WORKERS)
+
+
+def server_port(argv=()):
+    """
+    Port serwera Streamlit: z opcji --server.port w `argv`, zmiennej
+    STREAMLIT_SERVER_PORT, konfiguracji załadowanego już Streamlita albo domyślny.
+    """
+    for i, arg in enumerate(argv):
+        if arg.startswith("--server.port="):
+            return int(arg.split("=", 1)[1])
+        if arg == "--server.port" and i + 1 < len(argv):
+            return int(argv[i + 1])
+    if os.getenv("STREAMLIT_SERVER_PORT"):
+        return int(os.environ["STREAMLIT_SERVER_PORT"])
+    if "streamlit" in sys.modules:
+        from streamlit import config
+        return int(config.get_option("server.port"))
+    return DEFAULT_SERVER_PORT
+
+
+def status_path_for(port=None):
+    """Plik stanu rozgrzewania procesu serwera na danym porcie (RUNE_WARMUP_STATUS ma pierwszeństwo)."""
+    return WARMUP_STATUS_PATH or WARMUP_STATUS_TEMPLATE.format(port=port or server_port())
+
+
+class Warmup:
+    """
+    Jednorazowe rozgrzanie pamięci procesu: dane run, indeksy, banery
+    i wszystkie warianty obrazów run (oba kierunki, wszystkie rozmiary).
+
+    Postęp (wykonane / wszystkie kroki) i flaga gotowości zapisywane są
+    atomowo do pliku stanu, który czyta `python warmup.py --check`. Każdy
+    proces serwera ma własny plik (status_path_for), ustalany przy starcie.
+    """
+
+    def __init__(self, status_path=None, executor=IMAGE_BATCH_EXECUTOR,
+                 max_workers=IMAGE_BATCH_WORKERS):
+        self.status_path = status_path
+        self.executor = executor
+        self.max_workers = max_workers
+        self.state = "oczekuje"
+        self.done = 0
+        self.total = 0
+        self.step = ""
+        self.errors = []
+        self.started = None
+        self.finished = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.state == "gotowe"
+
+    def start(self):
+        """Uruchamia rozgrzewanie w wątku w tle; kolejne wywołania nic nie robią."""
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self.status_path = self.status_path or status_path_for()
+            self._thread = threading.Thread(target=self.run, name="rune-warmup", daemon=True)
+            self._thread.start()
+            return True
+
+    def run(self):
+        """Wykonuje wszystkie kroki rozgrzewania i zwraca słownik stanu."""
+        from repository import get_repository
+        from search import get_search_index
+        from similarity import get_similarity
+        from supp import get_runes, HERO_IMAGES
+
+        self.status_path = self.status_path or status_path_for()
+        self.started = time.time()
+        self.state = "trwa"
+        steps = [
+            ("dane run", get_repository),
+            ("runy", get_runes),
+            ("indeks wyszukiwania", get_search_index),
+            ("podobieństwo run", get_similarity),
+        ]
+        steps += [(f"baner {name}", lambda name=name: HERO_IMAGES.get(name)) for name in BANNERS]
+        # Obrazy run liczone jako jeden krok na runę - dane run muszą być już wczytane
+        self.total = len(steps) + len(get_repository().records)
+        self._write()
+
+        for label, action in steps:
+            self._run_step(label, action)
+        for runa in get_runes():
+            self._run_step(f"obrazy {runa.nazwa}", lambda runa=runa: self._prepare_rune(runa))
+
+        self.finished = time.time()
+        self.state = "gotowe" if not self.errors else "błąd"
+        self.step = ""
+        self._write()
+        print(f"Rozgrzewanie ({self.state}): {self.done}/{self.total} kroków "
+              f"w {self.finished - self.started:.2f} s")
+        return self.status()
+
+    def _prepare_rune(self, runa):
+        """Przygotowuje w puli wszystkie rozmiary obrazu runy w obu orientacjach."""
+        from models import ImageProcessor
+
+        # Rozmiary rysowane z atlasu (tryb statyczny) nie potrzebują osobnych obrazów
+        jobs = [(runa, size, is_reversed) for size in RUNE_VARIANT_SIZES for is_reversed in (False, True)
+                if not (size[0] == size[1] and runa.uses_atlas(is_reversed, size[0]))]
+        results, timings = ImageProcessor.prepare_batch(jobs, executor=self.executor, max_workers=self.max_workers)
+        if not all(results):
+            errors = "; ".join(dict.fromkeys(t["error"] for t in timings if t.get("error")))
+            raise RuntimeError(f"nie przygotowano {results.count('')} z {len(jobs)} obrazów: {errors}")
+
+    def _run_step(self, label, action):
+        """Wykonuje krok, zapisując błąd zamiast przerywać rozgrzewanie."""
+        self.step = label
+        try:
+            action()
+        except Exception as e:
+            self.errors.append(f"{label}: {e}")
+            print(f"Błąd rozgrzewania ({label}): {e}")
+        self.done += 1
+        self._write()
+
+    def status(self):
+        """Zwraca bieżący stan rozgrzewania jako słownik."""
+        return {
+            "pid": os.getpid(),
+            "state": self.state,
+            "ready": self.ready,
+            "done": self.done,
+            "total": self.total,
+            "step": self.step,
+            "errors": list(self.errors),
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+    def _write(self):
+        """Zapisuje stan do pliku (atomowo - czytelnik nigdy nie widzi połowy pliku)."""
+        try:
+            os.makedirs(os.path.dirname(self.status_path), exist_ok=True)
+            tmp_path = f"{self.status_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.status(), f, ensure_ascii=False)
+            os.replace(tmp_path, self.status_path)
+        except OSError as e:
+            print(f"Nie zapisano stanu rozgrzewania: {e}")
+
+
+# Wspólne dla procesu rozgrzewanie
+WARMUP = Warmup()
+
+
+def start_warmup(force=False, status_path=None):
+    """Uruchamia rozgrzewanie w tle, jeśli włączono je zmienną RUNE_WARMUP (albo force)."""
+    if not (force or WARMUP_ENABLED):
+        return False
+    if status_path and WARMUP._thread is None:
+        WARMUP.status_path = status_path
+    return WARMUP.start()
+
+
+def _process_alive(pid):
+    """Sprawdza, czy proces o danym numerze nadal działa."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def check(status_path=None):
+    """Zwraca (gotowe, opis) na podstawie pliku stanu rozgrzewania."""
+    status_path = status_path or status_path_for()
+    try:
+        with open(status_path, encoding="utf-8") as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        return False, f"brak stanu rozgrzewania ({status_path})"
+    if not isinstance(status, dict):
+        return False, f"błędny plik stanu rozgrzewania ({status_path})"
+
+    # Plik po poprzednim, zakończonym procesie nie oznacza gotowości
+    if not _process_alive(status.get("pid", 0)):
+        return False, f"proces {status.get('pid')} nie działa"
+
+    progress = f"{status.get('state', '?')} {status.get('done', '?')}/{status.get('total', '?')}"
+    if status.get("step"):
+        progress += f" ({status['step']})"
+    for error in status.get("errors", []):
+        progress += f"\n  błąd: {error}"
+    return bool(status.get("ready")), progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rozgrzewanie pamięci podręcznych aplikacji run")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--check", action="store_true", help="kod 0, gdy proces aplikacji jest rozgrzany")
+    group.add_argument("--run", action="store_true", help="rozgrzewanie na pierwszym planie")
+    parser.add_argument("--port", type=int, help="port procesu serwera (domyślnie jak w Streamlit)")
+    parser.add_argument("--status", help="plik stanu rozgrzewania (zamiast pliku wyznaczonego z portu)")
+    args = parser.parse_args(argv)
+    args.status = args.status or status_path_for(args.port)
+
+    if args.check:
+        ready, progress = check(args.status)
+        print(progress)
+        return 0 if ready else 1
+
+    status = Warmup(status_path=args.status).run()
+    return 0 if status["ready"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())